@@ -208,14 +208,16 @@ class CurveSegment:
                 dir_mult = 1   # antihorario
         
         # Generar puntos en orden correcto (de inicio a fin)
+        # Paso angular constante; trig y radio enlazados a locales para el bucle
+        radius = self.radius
+        step = dir_mult * delta_rad / num_points
+        cos, sin = math.cos, math.sin
+        
         points = [self.start_point]
         
         for i in range(1, num_points):
-            fraction = i / num_points
-            angle = start_angle + (dir_mult * delta_rad * fraction)
-            x = cx + self.radius * math.cos(angle)
-            y = cy + self.radius * math.sin(angle)
-            points.append((x, y))
+            angle = start_angle + step * i
+            points.append((cx + radius * cos(angle), cy + radius * sin(angle)))
         
         # Agregar punto final
         if self.end_point:
@@ -120,9 +120,6 @@ class GWZExporter:
                 "map_preview": map_preview_base64
             }
             
-            # Get curve rows set
-            curve_rows = getattr(table, 'curve_rows', set())
-            
             # Process each row
             row = 0
             while row < table.rowCount():
@@ -168,7 +165,7 @@ class GWZExporter:
                     continue
                 
                 # Determine if this is a curve row
-                is_curve = row in curve_rows
+                is_curve = table.is_curve(row)
                 
                 # Convert coordinates (assuming input is UTM)
                 # If coord_system is not UTM, we'd need to convert to UTM first
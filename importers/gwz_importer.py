@@ -103,7 +103,6 @@ class GWZImporter:
         try:
             # Clear existing data
             table.setRowCount(0)
-            table.curve_rows = set()
             
             metadata = gwz_data.get("metadata", {})
             vertices = gwz_data.get("vertices", [])
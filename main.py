@@ -1,6 +1,8 @@
 import sys
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
+from ui.custom_titlebar import warm_titlebar_icons
 from utils.logger import setup_logging
 
 def main():
@@ -10,6 +12,8 @@ def main():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # Precargar iconos de la barra de título en cuanto arranca el bucle de eventos
+    QTimer.singleShot(0, warm_titlebar_icons)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
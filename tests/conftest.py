@@ -0,0 +1,10 @@
+# tests/conftest.py
+"""
+Shared pytest configuration.
+Makes the project root importable for every test module.
+"""
+
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -5,11 +5,6 @@ Tests UTM zone detection, DMS conversion, and coordinate validation.
 """
 
 import unittest
-import sys
-import os
-
-# Add root directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.coordinate_systems import (
     detect_utm_zone,
@@ -21,6 +16,14 @@ from utils.coordinate_systems import (
     get_utm_epsg
 )
 
+# (decimal degrees, is_longitude) fixtures shared by the DMS round-trip test
+_DMS_CASES = (
+    (19.4326, False),
+    (-33.4489, False),
+    (139.6917, True),
+    (-99.1332, True),
+)
+
 
 class TestDetectUTMZone(unittest.TestCase):
     """Tests for detect_utm_zone function."""
@@ -149,6 +152,13 @@ class TestDMSConversion(unittest.TestCase):
         """Convert DMS West to DD."""
         dd = dms_to_dd(99, 7, 59.52, 'W')
         self.assertAlmostEqual(dd, -99.1332, places=4)
+    
+    def test_dms_roundtrip(self):
+        """DD -> DMS -> DD should recover the original value."""
+        for dd, is_longitude in _DMS_CASES:
+            with self.subTest(dd=dd):
+                recovered = dms_to_dd(*dd_to_dms(dd, is_longitude=is_longitude))
+                self.assertAlmostEqual(recovered, dd, places=4)
 
 
 class TestValidateDMSCoordinate(unittest.TestCase):
@@ -0,0 +1,176 @@
+# tests/test_coordinate_table.py
+"""
+Unit tests for coordinate_table module.
+Tests the UTM cell validator used by UTMDelegate and CoordTable curve state.
+"""
+
+import unittest
+
+from PySide6.QtCore import Qt, QEvent
+from PySide6.QtGui import QValidator, QKeyEvent
+from PySide6.QtWidgets import QApplication, QTableWidgetItem
+
+from ui.coordinate_table import _UTMValidator, CoordTable
+
+
+class TestUTMValidator(unittest.TestCase):
+    """Tests for _UTMValidator (6-7 digits + optional decimals)."""
+    
+    def setUp(self):
+        self.validator = _UTMValidator()
+    
+    def _state(self, text):
+        return self.validator.validate(text, len(text))
+    
+    def test_six_digits(self):
+        """Six integer digits are acceptable."""
+        self.assertEqual(self._state("484521"), QValidator.Acceptable)
+    
+    def test_seven_digits_with_decimals(self):
+        """Seven integer digits with decimals are acceptable."""
+        self.assertEqual(self._state("2147890.25"), QValidator.Acceptable)
+    
+    def test_partial_input(self):
+        """Prefixes of a valid value are intermediate."""
+        self.assertEqual(self._state(""), QValidator.Intermediate)
+        self.assertEqual(self._state("4845"), QValidator.Intermediate)
+        self.assertEqual(self._state("484521."), QValidator.Intermediate)
+    
+    def test_too_many_digits(self):
+        """More than seven integer digits is invalid."""
+        self.assertEqual(self._state("12345678"), QValidator.Invalid)
+    
+    def test_short_integer_part_with_decimals(self):
+        """Decimals after fewer than six digits are invalid."""
+        self.assertEqual(self._state("12345.6"), QValidator.Invalid)
+    
+    def test_non_digit_characters(self):
+        """Letters, signs and non-ASCII digits are invalid."""
+        self.assertEqual(self._state("48452a"), QValidator.Invalid)
+        self.assertEqual(self._state("-484521"), QValidator.Invalid)
+        self.assertEqual(self._state("484521.5x"), QValidator.Invalid)
+        self.assertEqual(self._state("48452١"), QValidator.Invalid)
+
+
+class TestCoordTableCurves(unittest.TestCase):
+    """Tests for CoordTable curve rows (requires a Qt application)."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+    
+    def setUp(self):
+        self.table = CoordTable(0, 3)
+        for _ in range(3):
+            self.table.append_point_row()
+    
+    def tearDown(self):
+        self.table.deleteLater()
+    
+    def test_parameters_after_subrow_item_replaced(self):
+        """Replacing a sub-row value item (e.g. paste) doesn't break reads."""
+        self.table.mark_as_curve(1)
+        self.table.setItem(3, 2, QTableWidgetItem("100"))
+        
+        params = self.table.get_curve_parameters(1)
+        
+        self.assertEqual(params['radio'], "100")
+        self.assertEqual(params['delta'], "")
+    
+    def test_convert_then_mark_reuses_pooled_items(self):
+        """Sub-row items of a converted curve are reused, cleared, by the next one."""
+        self.table.mark_as_curve(1)
+        radio_item = self.table.item(3, 2)
+        radio_item.setText("50")
+        
+        self.table.convert_to_point(1)
+        self.assertEqual(self.table.rowCount(), 3)
+        self.table.mark_as_curve(2)
+        
+        self.assertIs(self.table.item(4, 2), radio_item)
+        self.assertEqual(self.table.item(4, 1).text(), "RADIO")
+        self.assertEqual(self.table.get_curve_parameters(2)['radio'], "")
+    
+    def test_incomplete_subrows_are_not_pooled(self):
+        """A curve missing a sub-row item is removed without feeding the pool."""
+        self.table.mark_as_curve(1)
+        self.table.takeItem(4, 2)
+        
+        self.table.convert_to_point(1)
+        
+        self.assertEqual(self.table._subrow_pool, [])
+        self.assertEqual(self.table.rowCount(), 3)
+    
+    def test_curve_state_follows_row_inserted_above(self):
+        """Inserting a row above a curve shifts its state with it."""
+        self.table.mark_as_curve(1)
+        self.table.item(3, 2).setText("25")
+        
+        self.table.insertRow(0)
+        
+        self.assertFalse(self.table.is_curve(1))
+        self.assertTrue(self.table.is_curve(2))
+        self.assertEqual(self.table.curve_rows, {2})
+        self.assertEqual(self.table.get_curve_parameters(2)['radio'], "25")
+    
+    def test_tab_skips_collapsed_subrows(self):
+        """Tab from Y of a collapsed curve goes to the next point row."""
+        self.table.mark_as_curve(1)
+        self.table.toggle_expansion(1)
+        self.assertFalse(self.table.is_expanded(1))
+        
+        self.table.setCurrentCell(1, 2)
+        self.table.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_Tab, Qt.NoModifier))
+        
+        self.assertEqual(self.table.currentRow(), 8)
+        self.assertEqual(self.table.currentColumn(), 1)
+    
+    def test_tab_enters_expanded_subrows(self):
+        """Tab into an expanded curve lands on its first sub-row."""
+        self.table.mark_as_curve(1)
+        self.table.toggle_expansion(1)
+        self.table.toggle_expansion(1)
+        
+        self.table.setCurrentCell(1, 2)
+        self.table.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_Tab, Qt.NoModifier))
+        
+        self.assertEqual(self.table.currentRow(), 2)
+    
+    def test_append_ids_skip_curve_subrows(self):
+        """Point IDs stay sequential after a curve's sub-rows."""
+        self.table.mark_as_curve(2)
+        
+        row = self.table.append_point_row()
+        
+        self.assertEqual(row, 9)
+        self.assertEqual(self.table.item(row, 0).text(), "4")
+    
+    def test_insert_point_row_keeps_other_ids(self):
+        """A mid-table point row takes the next ID without renumbering."""
+        self.table.mark_as_curve(0)
+        
+        row = self.table.insert_point_row(8)
+        
+        self.assertEqual(self.table.item(row, 0).text(), "4")
+        self.assertEqual(self.table.item(7, 0).text(), "2")
+        self.assertEqual(self.table.item(9, 0).text(), "3")
+        self.assertEqual(self.table.item(1, 0).text(), "")  # Sub-row untouched
+    
+    def test_paste_appends_rows_with_point_ids(self):
+        """Pasted rows past the end get point IDs, not row numbers."""
+        from unittest.mock import MagicMock
+        from ui.table_manager import TableManager
+        
+        self.table.mark_as_curve(1)
+        self.table.setCurrentCell(8, 1)
+        QApplication.clipboard().setText("500000,4000000\n500010,4000010")
+        
+        pasted = TableManager(self.table, MagicMock()).paste_from_clipboard()
+        
+        self.assertEqual(pasted, 2)
+        self.assertEqual(self.table.rowCount(), 10)
+        self.assertEqual(self.table.item(9, 0).text(), "4")
+
+
+if __name__ == '__main__':
+    unittest.main()
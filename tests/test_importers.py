@@ -1,9 +1,5 @@
 import unittest
 import os
-import sys
-
-# Add root directory to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from importers.csv_importer import CSVImporter
 from core.exceptions import FileImportError, InsufficientDataError
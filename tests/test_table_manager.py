@@ -5,13 +5,8 @@ Tests table operations without requiring Qt application.
 """
 
 import unittest
-import sys
-import os
 from unittest.mock import MagicMock, patch, PropertyMock
 
-# Add root directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 
 class TestTableManagerBasic(unittest.TestCase):
     """Basic tests for TableManager that don't require Qt."""
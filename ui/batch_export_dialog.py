@@ -9,7 +9,7 @@ from pathlib import Path
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox,
-    QPushButton, QLineEdit, QFileDialog, QGroupBox, QProgressBar
+    QPushButton, QLineEdit, QFileDialog, QGroupBox, QProgressBar, QWidget
 )
 
 from ui.custom_titlebar import CustomTitleBar
@@ -18,6 +18,12 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _wire_signals(emitter, pairs):
+    """Connect (signal_name, slot) pairs on a single emitter."""
+    for name, slot in pairs:
+        getattr(emitter, name).connect(slot)
+
+
 class BatchExportDialog(QDialog):
     """
     Dialog for exporting coordinates to multiple formats at once.
@@ -45,8 +51,10 @@ class BatchExportDialog(QDialog):
         
         # Custom title bar
         self.title_bar = CustomTitleBar("Exportación por Lotes", self)
-        self.title_bar.closeClicked.connect(self.reject)
-        self.title_bar.minimizeClicked.connect(self.showMinimized)
+        _wire_signals(self.title_bar, (
+            ("closeClicked", self.reject),
+            ("minimizeClicked", self.showMinimized),
+        ))
         layout.addWidget(self.title_bar)
         
         # Content
@@ -138,7 +146,7 @@ class BatchExportDialog(QDialog):
         content.addLayout(btn_layout)
         
         # Add content to main layout
-        content_widget = QLabel()
+        content_widget = QWidget()
         content_widget.setLayout(content)
         layout.addWidget(content_widget)
     
@@ -14,10 +14,14 @@ class ConfigDialog(CustomDialog):
     
     language_changed = Signal(str)  # Emits when language changes
     
+    # Language codes in the same order as the language combo box items
+    _LANG_CODES = ("es", "en")
+    
     def __init__(self, parent=None, current_settings=None):
         super().__init__(tr("config_title"), parent, show_logo=True)
         
         self.current_settings = current_settings or {}
+        self._initial_lang = get_current_language()
         self.resize(500, 400)
         
         # Aplicar tema
@@ -51,11 +55,9 @@ class ConfigDialog(CustomDialog):
         self.cb_language = QComboBox()
         self.cb_language.addItems([tr("spanish"), tr("english")])
         # Set current language
-        current_lang = get_current_language()
-        if current_lang == "en":
-            self.cb_language.setCurrentIndex(1)
-        else:
-            self.cb_language.setCurrentIndex(0)
+        current_lang = self._initial_lang
+        if current_lang in self._LANG_CODES:
+            self.cb_language.setCurrentIndex(self._LANG_CODES.index(current_lang))
         lang_layout.addWidget(self.cb_language)
         general_layout.addLayout(lang_layout)
         
@@ -88,13 +90,13 @@ class ConfigDialog(CustomDialog):
     def _on_save(self):
         """Handle save button click."""
         # Get selected language
-        lang_text = self.cb_language.currentText()
-        new_lang = "en" if "English" in lang_text else "es"
-        old_lang = get_current_language()
+        new_lang = self._LANG_CODES[self.cb_language.currentIndex()]
+        old_lang = self._initial_lang
         
         # Change language if different
         if new_lang != old_lang:
             set_language(new_lang)
+            self._initial_lang = new_lang
             self.language_changed.emit(new_lang)
         
         self.accept()
@@ -104,7 +106,7 @@ class ConfigDialog(CustomDialog):
         return {
             'dark_mode': self.chk_dark_mode.isChecked(),
             'autosave': self.chk_autosave.isChecked(),
-            'language': self.cb_language.currentText()
+            'language': self._LANG_CODES[self.cb_language.currentIndex()]
         }
     
     def get_values(self):
@@ -3,14 +3,207 @@
 Custom table widget for coordinate input with UTM validation.
 """
 
-from PySide6.QtCore import Qt, QRegularExpression, QEvent
-from PySide6.QtGui import QRegularExpressionValidator, QBrush
-from PySide6.QtWidgets import QStyledItemDelegate, QTableWidget, QTableWidgetItem
+from functools import partial
+
+from PySide6.QtCore import Qt, QEvent
+from PySide6.QtGui import (
+    QValidator, QBrush, QColor, QFont, QPalette, QShortcut, QKeySequence, QPainter
+)
+from PySide6.QtWidgets import (
+    QStyledItemDelegate, QTableWidget, QTableWidgetItem, QWidget, QToolTip
+)
+from shiboken6 import isValid
 
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Curve sub-row labels, in row order below the main curve row
+_CURVE_SUBROW_LABELS = ("DELTA", "RADIO", "CENTRO_X", "CENTRO_Y", "LONG.CURVA", "SUB.TAN")
+
+# Shared colors/fonts for curve rows (built once, reused for every curve)
+# Item backgrounds/foregrounds are brushes so setBackground/setForeground
+# don't wrap a QColor into a new QBrush on every call
+_SUBROW_BG = QBrush(QColor(245, 245, 245))       # Gris claro
+_SUBROW_FG = QBrush(QColor(60, 60, 60))          # Gris oscuro para texto
+_SUBROW_FONT = QFont("Arial", 9, QFont.Bold)
+_CURVE_BG_BRUSH = QBrush(QColor(227, 242, 253))  # Azul muy claro (#E3F2FD)
+_CURVE_FG = QColor(21, 101, 192)                 # Azul Material (#1565C0), palette color
+_WHITE = QBrush(QColor(255, 255, 255))
+
+# Max. number of removed curve sub-row blocks kept for reuse per table
+_SUBROW_POOL_MAX = 8
+
+# Curve header cell (ID column of a curve main row)
+_HEADER_ARROW_FG = QColor(0x66, 0x66, 0x66)
+_HEADER_ARROW_HOVER_BG = QColor(227, 242, 253)  # #E3F2FD
+
+# Item data role holding 1/0 for the last UTM validation result of a cell
+_VALIDITY_ROLE = Qt.UserRole
+_INVALID_FG = QColor(Qt.red)
+
+
+class _CurveState:
+    """State of one curve main row, kept in CoordTable._curves."""
+    __slots__ = ('expanded', 'items', 'original_id', 'header')
+    
+    def __init__(self, items, original_id, header):
+        self.expanded = True          # Sub-rows visible
+        self.items = items            # Value items (column 2) of the 6 sub-rows
+        self.original_id = original_id
+        self.header = header          # CurveHeaderCell shown in column 0
+
+
+def apply_curve_row_style(option, index):
+    """
+    Give curve main rows their highlight while a delegate builds its style option.
+    
+    The colors come from the table's per-row curve flag at paint time rather
+    than from per-item background/foreground brushes.
+    """
+    is_curve = getattr(option.widget, 'is_curve', None)
+    if is_curve is not None and is_curve(index.row()):
+        option.backgroundBrush = _CURVE_BG_BRUSH
+        if index.column() > 0:  # ID column is covered by the curve widget
+            option.palette.setColor(QPalette.Text, _CURVE_FG)
+
+
+class CurveRowDelegate(QStyledItemDelegate):
+    """Default CoordTable delegate: standard editing plus curve row highlight."""
+    
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        apply_curve_row_style(option, index)
+
+
+class CurveHeaderCell(QWidget):
+    """
+    ID cell of a curve main row: curve icon, bold ID and expand/collapse
+    arrow, painted directly instead of laid out as separate child widgets.
+    """
+    
+    _ARROW_WIDTH = 24  # Clickable area at the right edge
+    
+    def __init__(self, original_id, on_toggle, parent=None):
+        """
+        Args:
+            original_id: Point ID text shown next to the icon
+            on_toggle: Callable invoked when the arrow is clicked
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self._id = original_id
+        self._expanded = True
+        self._on_toggle = on_toggle
+        self._arrow_hover = False
+        # Read by code that looks up point IDs in curve rows
+        self.setProperty("original_id", original_id)
+        self.setMouseTracking(True)
+        
+        self._icon_font = QFont(self.font())
+        self._icon_font.setPixelSize(14)
+        self._id_font = QFont(self.font())
+        self._id_font.setBold(True)
+        self._arrow_font = QFont(self.font())
+        self._arrow_font.setPixelSize(10)
+    
+    def set_expanded(self, expanded):
+        """Update the arrow to the expanded/collapsed state."""
+        self._expanded = expanded
+        self.update()
+    
+    def _in_arrow(self, x):
+        return x >= self.width() - self._ARROW_WIDTH
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = self.rect().adjusted(2, 0, -2, 0)
+        
+        # Icono de curva (emoji)
+        painter.setFont(self._icon_font)
+        icon_rect = painter.boundingRect(rect, Qt.AlignLeft | Qt.AlignVCenter, "📐")
+        painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, "📐")
+        
+        # ID text
+        painter.setFont(self._id_font)
+        painter.setPen(_CURVE_FG)
+        id_rect = rect.adjusted(icon_rect.width() + 2, 0, -self._ARROW_WIDTH, 0)
+        painter.drawText(id_rect, Qt.AlignLeft | Qt.AlignVCenter, self._id)
+        
+        # Flecha expandir/colapsar
+        arrow_rect = rect.adjusted(rect.width() - 20, 0, 0, 0)
+        arrow_rect.setTop(arrow_rect.center().y() - 10)
+        arrow_rect.setHeight(20)
+        if self._arrow_hover:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(_HEADER_ARROW_HOVER_BG)
+            painter.drawRoundedRect(arrow_rect, 3, 3)
+        painter.setFont(self._arrow_font)
+        painter.setPen(_HEADER_ARROW_FG)
+        painter.drawText(arrow_rect, Qt.AlignCenter, "▼" if self._expanded else "►")
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._in_arrow(event.position().x()):
+            event.accept()
+            self._on_toggle()
+        else:
+            # Fuera de la flecha: dejar que la tabla seleccione la celda
+            super().mousePressEvent(event)
+    
+    def mouseMoveEvent(self, event):
+        hover = self._in_arrow(event.position().x())
+        if hover != self._arrow_hover:
+            self._arrow_hover = hover
+            self.update()
+        super().mouseMoveEvent(event)
+    
+    def leaveEvent(self, event):
+        if self._arrow_hover:
+            self._arrow_hover = False
+            self.update()
+        super().leaveEvent(event)
+    
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            if not self._in_arrow(event.pos().x()):
+                tip = "Curva"
+            elif self._expanded:
+                tip = "Colapsar parámetros de curva"
+            else:
+                tip = "Expandir parámetros de curva"
+            QToolTip.showText(event.globalPos(), tip, self)
+            return True
+        return super().event(event)
+
+
+def _is_digits(text):
+    """True if text is a non-empty run of ASCII digits."""
+    return text.isascii() and text.isdigit()
+
+
+class _UTMValidator(QValidator):
+    r"""
+    Validator for UTM cell input: 6-7 digits + optional decimals.
+    Same rules as the pattern ^\d{6,7}(\.\d+)?$ but checked with plain string ops.
+    """
+    
+    def validate(self, text, pos):
+        if not text:
+            return QValidator.Intermediate
+        
+        int_part, dot, frac = text.partition('.')
+        if not _is_digits(int_part) or len(int_part) > 7:
+            return QValidator.Invalid
+        
+        if not dot:
+            return QValidator.Acceptable if len(int_part) >= 6 else QValidator.Intermediate
+        
+        if len(int_part) < 6:
+            return QValidator.Invalid
+        if not frac:
+            return QValidator.Intermediate
+        return QValidator.Acceptable if _is_digits(frac) else QValidator.Invalid
+
 
 class UTMDelegate(QStyledItemDelegate):
     """
@@ -18,81 +211,94 @@ class UTMDelegate(QStyledItemDelegate):
     Provides real-time validation and tab navigation between cells.
     """
     
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Validators are stateless, so every editor shares this one
+        self._validator = _UTMValidator(self)
+        # Owning table, resolved once instead of on every Tab press
+        self._table = parent if isinstance(parent, QTableWidget) else None
+    
     def createEditor(self, parent, option, index):
         """Create editor widget with UTM coordinate validation."""
         editor = super().createEditor(parent, option, index)
-        
-        # 6-7 digits + optional decimals for UTM coordinates
-        rx = QRegularExpression(r'^\d{6,7}(\.\d+)?$')
-        editor.setValidator(QRegularExpressionValidator(rx, editor))
-        editor.installEventFilter(self)
-        editor.setProperty("row", index.row())
-        editor.setProperty("column", index.column())
+        if self._table is None and isinstance(option.widget, QTableWidget):
+            self._table = option.widget  # The view is known here, no parent walk needed
+        
+        editor.setValidator(self._validator)
+        # Tab is bound on the editor itself, so other keys never reach Python
+        tab = QShortcut(QKeySequence(Qt.Key_Tab), editor)
+        tab.setContext(Qt.WidgetShortcut)
+        tab.activated.connect(partial(self._on_tab, editor))
+        # Plain attributes avoid a QVariant round-trip on every Tab press
+        editor._ct_row = index.row()
+        editor._ct_col = index.column()
         
         return editor
 
-    def eventFilter(self, obj, event):
+    def _on_tab(self, editor):
         """
         Handle Tab key navigation between coordinate cells.
         Tab from X column -> Y column
         Tab from Y column -> X column of next row (auto-creates row if needed)
         """
-        if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Tab:
-            table = obj.parent()
-            while table and not isinstance(table, QTableWidget):
-                table = table.parent()
-            
-            if not table:
-                return False
-            
-            row = obj.property("row")
-            col = obj.property("column")
+        table = self._owner_table(editor)
+        if not table:
+            return
+        
+        row = editor._ct_row
+        col = editor._ct_col
+        
+        if col == 1:  # X (Este) column
+            # Move to Y (Norte) column
+            table.setCurrentCell(row, 2)
+            table.edit(table.model().index(row, 2))
             
-            if col == 1:  # X (Este) column
-                # Move to Y (Norte) column
-                table.setCurrentCell(row, 2)
-                item = table.item(row, 2)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    table.setItem(row, 2, item)
-                table.editItem(item)
-                
-            elif col == 2:  # Y (Norte) column
-                # Move to next row's X column, skipping hidden curve sub-rows
+        elif col == 2:  # Y (Norte) column
+            # Move to next row's X column, skipping hidden curve sub-rows
+            if hasattr(table, 'next_visible_row'):
+                next_row = table.next_visible_row(row)
+            else:
                 next_row = row + 1
-                
-                # Skip hidden rows (curve sub-rows)
                 while next_row < table.rowCount() and table.isRowHidden(next_row):
                     next_row += 1
-                
-                if next_row >= table.rowCount():
-                    # Auto-create new row
+            
+            if next_row >= table.rowCount():
+                # Auto-create new row
+                if hasattr(table, 'append_point_row'):
+                    next_row = table.append_point_row()
+                else:
                     table.insertRow(next_row)
                     id_item = QTableWidgetItem(str(next_row + 1))
                     id_item.setFlags(Qt.ItemIsEnabled)
                     table.setItem(next_row, 0, id_item)
-                
-                table.setCurrentCell(next_row, 1)
-                item = table.item(next_row, 1)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    table.setItem(next_row, 1, item)
-                table.editItem(item)
             
-            return True
-        
-        return super().eventFilter(obj, event)
+            table.setCurrentCell(next_row, 1)
+            table.edit(table.model().index(next_row, 1))
+
+    def _owner_table(self, editor):
+        """Return the table the editor belongs to, caching it on first lookup."""
+        if self._table is None:
+            table = editor.parent()
+            while table and not isinstance(table, QTableWidget):
+                table = table.parent()
+            self._table = table
+        return self._table
 
     def setModelData(self, editor, model, index):
-        """Set model data and apply color based on validation."""
-        text = editor.text()
-        model.setData(index, text)
-        
-        # Color text based on validation
-        if not (model.flags(index) & Qt.ItemIsSelectable and
-                model.data(index, Qt.BackgroundRole)):
-            color = Qt.black if editor.hasAcceptableInput() else Qt.red
-            model.setData(index, QBrush(color), Qt.ForegroundRole)
+        """Set model data and record whether it passed validation."""
+        # Text and validity flag in one model write (one dataChanged);
+        # the validity is a plain int, the text color is applied in initStyleOption
+        model.setItemData(index, {
+            Qt.EditRole: editor.text(),
+            _VALIDITY_ROLE: 1 if editor.hasAcceptableInput() else 0,
+        })
+    
+    def initStyleOption(self, option, index):
+        """Paint text red for cells whose last edit failed validation."""
+        super().initStyleOption(option, index)
+        apply_curve_row_style(option, index)
+        if index.data(_VALIDITY_ROLE) == 0:
+            option.palette.setColor(QPalette.Text, _INVALID_FG)
 
 
 class CoordTable(QTableWidget):
@@ -103,14 +309,133 @@ class CoordTable(QTableWidget):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Track curve data: {main_row_index: {'delta': '...', 'radio': '...', 'centro': '...'}}
-        self.curve_data = {}
-        # Track which rows are expanded
-        self.expanded_rows = set()
-        # Track which rows are curve type (even if collapsed)
-        self.curve_rows = set()
+        # One slot per row: a _CurveState for curve main rows, None otherwise.
+        # Kept aligned with the rows as they are inserted/removed so curve
+        # state follows its row
+        self._curves = [None] * self.rowCount()
+        self.model().rowsInserted.connect(self._on_rows_inserted)
+        self.model().rowsRemoved.connect(self._on_rows_removed)
+        # Monotonic point ID for new rows; curve sub-rows don't consume IDs
+        self._next_id = self.rowCount() + 1
+        self._inserting_subrows = False
+        # Lazily built "next visible row" table; None when stale
+        self._next_visible = None
+        # Sub-row items taken back by convert_to_point, one tuple of
+        # (id, label, value) item triples per curve, reused by mark_as_curve
+        self._subrow_pool = []
+        # Curve rows are highlighted at paint time from _curves
+        self.setItemDelegate(CurveRowDelegate(self))
         # Default number of intermediate points for densification
         self.curve_densification_points = 15  # Default: 10-20 range
+    
+    def _on_rows_inserted(self, parent, first, last):
+        """Open empty state slots for newly inserted rows."""
+        self._curves[first:first] = [None] * (last - first + 1)
+        self._next_visible = None
+        if not self._inserting_subrows:
+            self._next_id += last - first + 1
+    
+    def _on_rows_removed(self, parent, first, last):
+        """Drop the state slots of removed rows."""
+        del self._curves[first:last + 1]
+        self._next_visible = None
+        if not self._curves:
+            self._next_id = 1
+    
+    def is_curve(self, row):
+        """True if the row is a curve main row."""
+        return 0 <= row < len(self._curves) and self._curves[row] is not None
+    
+    def is_expanded(self, row):
+        """True if the row is a curve whose sub-rows are visible."""
+        state = self._curves[row] if 0 <= row < len(self._curves) else None
+        return state is not None and state.expanded
+    
+    def next_visible_row(self, row):
+        """
+        Index of the first visible row after `row`, or rowCount() if none.
+        
+        Answered from a table rebuilt only after rows are inserted, removed,
+        shown or hidden, so Tab doesn't rescan collapsed curve sub-rows.
+        """
+        if self._next_visible is None:
+            # table[i] = first visible row at or after i (rowCount() if none)
+            count = self.rowCount()
+            table = [count] * (count + 1)
+            for r in range(count - 1, -1, -1):
+                table[r] = r if not self.isRowHidden(r) else table[r + 1]
+            self._next_visible = table
+        
+        start = max(row + 1, 0)
+        if start >= len(self._next_visible):
+            return self.rowCount()
+        return self._next_visible[start]
+    
+    def setRowHidden(self, row, hide):
+        super().setRowHidden(row, hide)
+        self._next_visible = None
+    
+    def append_point_row(self):
+        """
+        Append a point row with the next point ID.
+        
+        IDs come from a monotonic counter instead of the row index, so they
+        stay sequential when curve sub-rows sit between points.
+        
+        Returns:
+            Index of the new row
+        """
+        return self.insert_point_row(self.rowCount())
+    
+    def insert_point_row(self, row):
+        """
+        Insert a point row at `row` with the next point ID.
+        
+        The other rows keep their IDs (no renumbering pass), so inserting
+        in the middle of the table is O(1) and never touches curve sub-rows.
+        
+        Args:
+            row: Index where the new row is inserted
+        
+        Returns:
+            Index of the new row
+        """
+        point_id = self._next_id
+        self.insertRow(row)
+        id_item = QTableWidgetItem(str(point_id))
+        id_item.setFlags(Qt.ItemIsEnabled)
+        self.setItem(row, 0, id_item)
+        return row
+    
+    @property
+    def curve_rows(self):
+        """Set of curve main-row indices (snapshot)."""
+        return {row for row, state in enumerate(self._curves) if state is not None}
+    
+    def load_rows(self, rows):
+        """
+        Replace the table contents with plain coordinate rows in one pass.
+        
+        The row count is set once and repaints are suspended while the
+        items are created, instead of inserting and laying out row by row.
+        Curve state is reset along with the rows.
+        
+        Args:
+            rows: Sequence of row sequences (ID, X, Y) with cell texts
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            self.setRowCount(0)
+            self.setRowCount(len(rows))
+            
+            for row_idx, row_data in enumerate(rows):
+                for col_idx, cell_text in enumerate(row_data):
+                    item = QTableWidgetItem(cell_text)
+                    if col_idx == 0:  # ID column
+                        item.setFlags(Qt.ItemIsEnabled)
+                    self.setItem(row_idx, col_idx, item)
+        finally:
+            self.setUpdatesEnabled(True)
         
     def mark_as_curve(self, row):
         """
@@ -120,91 +445,55 @@ class CoordTable(QTableWidget):
         Args:
             row: Índice de la fila a convertir en curva
         """
-        from PySide6.QtWidgets import QPushButton, QWidget, QHBoxLayout, QLabel
-        from PySide6.QtGui import QColor, QFont
-        
-        if row in self.curve_rows:
+        if self.is_curve(row):
             return  # Ya es una curva
         
-        # Insertar 6 sub-filas debajo de la fila principal 
-        # (DELTA, RADIO, CENTRO_X, CENTRO_Y, LONG.CURVA, SUB.TAN)
-        for i in range(6):
-            self.insertRow(row + i + 1)
-        
-        # Configurar sub-filas con títulos en columna X, valores en columna Y
-        self._setup_subrow(row + 1, "DELTA", "")
-        self._setup_subrow(row + 2, "RADIO", "")
-        self._setup_subrow(row + 3, "CENTRO_X", "")  # Este (X)
-        self._setup_subrow(row + 4, "CENTRO_Y", "")  # Norte (Y)
-        self._setup_subrow(row + 5, "LONG.CURVA", "")
-        self._setup_subrow(row + 6, "SUB.TAN", "")
-        
-        # Guardar el contenido original del ID antes de reemplazar
-        id_item = self.item(row, 0)
-        original_id = id_item.text() if id_item else str(row + 1)
-        
-        # Crear widget contenedor con icono de curva + botón expandir
-        container = QWidget()
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(2, 0, 2, 0)
-        layout.setSpacing(2)
-        
-        # Icono de curva (emoji)
-        curve_icon = QLabel("📐")
-        curve_icon.setStyleSheet("font-size: 14px;")
-        curve_icon.setToolTip("Curva")
-        layout.addWidget(curve_icon)
-        
-        # ID text
-        id_label = QLabel(original_id)
-        id_label.setStyleSheet("font-weight: bold; color: #1565C0;")
-        layout.addWidget(id_label)
-        
-        layout.addStretch()
-        
-        # Botón expandir/colapsar
-        expand_btn = QPushButton("▼")
-        expand_btn.setFixedSize(20, 20)
-        expand_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background: transparent;
-                font-size: 10px;
-                color: #666;
-            }
-            QPushButton:hover {
-                background: #E3F2FD;
-                border-radius: 3px;
-            }
-        """)
-        expand_btn.setToolTip("Expandir/Colapsar parámetros de curva")
-        expand_btn.clicked.connect(lambda: self.toggle_expansion(row))
-        layout.addWidget(expand_btn)
-        
-        # Guardar referencia para toggle
-        container.setProperty("expand_btn", expand_btn)
-        container.setProperty("original_id", original_id)
-        
-        self.setCellWidget(row, 0, container)
-        
-        # Marcar como curva y expandida
-        self.curve_rows.add(row)
-        self.expanded_rows.add(row)
-        
-        # Cambiar color de fondo de la fila principal con estilo distintivo
-        curve_bg_color = QColor(227, 242, 253)  # Azul muy claro (#E3F2FD)
-        curve_text_color = QColor(21, 101, 192)  # Azul Material (#1565C0)
-        
-        for col in range(self.columnCount()):
-            item = self.item(row, col)
-            if item:
-                item.setBackground(curve_bg_color)
-                if col > 0:  # No cambiar color de texto en columna ID (es un widget)
-                    item.setForeground(curve_text_color)
+        # Build all sub-rows with a single repaint at the end
+        was_blocked = self.blockSignals(True)
+        self.setUpdatesEnabled(False)
+        try:
+            # Insertar 6 sub-filas debajo de la fila principal 
+            # (DELTA, RADIO, CENTRO_X, CENTRO_Y, LONG.CURVA, SUB.TAN)
+            # (una sola inserción en el modelo: una notificación rowsInserted)
+            self._inserting_subrows = True
+            try:
+                self.model().insertRows(row + 1, len(_CURVE_SUBROW_LABELS))
+            finally:
+                self._inserting_subrows = False
+            
+            # Configurar sub-filas con títulos en columna X, valores en columna Y
+            # (reutilizando items de una curva convertida antes, si los hay)
+            if self._subrow_pool:
+                pooled = self._subrow_pool.pop()
+            else:
+                pooled = (None,) * len(_CURVE_SUBROW_LABELS)
+            value_items = tuple(
+                self._setup_subrow(row + offset, label, "", items)
+                for offset, (label, items) in enumerate(zip(_CURVE_SUBROW_LABELS, pooled), start=1)
+            )
+            
+            # Guardar el contenido original del ID antes de reemplazar
+            id_item = self.item(row, 0)
+            original_id = id_item.text() if id_item else str(row + 1)
+            
+            # Celda con icono de curva + ID + flecha expandir (un solo widget pintado)
+            # Resolver la fila al hacer clic: puede haberse desplazado desde aquí
+            header = CurveHeaderCell(
+                original_id,
+                lambda: self.toggle_expansion(self.indexAt(header.pos()).row())
+            )
+            self.setCellWidget(row, 0, header)
+            
+            # Marcar como curva y expandida (los delegados pintan el estilo distintivo)
+            self._curves[row] = _CurveState(value_items, original_id, header)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.blockSignals(was_blocked)
+            self.viewport().update()
         
         logger.info(f"Fila {row} (ID: {original_id}) marcada como curva con indicador visual")
     
-    def _setup_subrow(self, row, label, value):
+    def _setup_subrow(self, row, label, value, items=None):
         """
         Configura una sub-fila con título en X y valor editable en Y.
         
@@ -212,29 +501,62 @@ class CoordTable(QTableWidget):
             row: Índice de la sub-fila
             label: Etiqueta (DELTA, RADIO, CENTRO, etc.)
             value: Valor inicial
+            items: Tripleta (id, etiqueta, valor) ya configurada para esta
+                etiqueta, tomada de _subrow_pool; None para crear items nuevos
+        
+        Returns:
+            El item editable de valor (columna Y)
         """
-        from PySide6.QtGui import QColor, QFont
+        if items is not None:
+            empty_id, label_item, value_item = items
+            value_item.setText(value)
+        else:
+            # Columna 0 (ID): Vacía y no editable
+            empty_id = QTableWidgetItem("")
+            empty_id.setFlags(Qt.ItemIsEnabled)
+            empty_id.setBackground(_SUBROW_BG)
+            
+            # Columna 1 (X): Título (no editable, negrita)
+            label_item = QTableWidgetItem(label)
+            label_item.setFlags(Qt.ItemIsEnabled)
+            label_item.setBackground(_SUBROW_BG)
+            label_item.setFont(_SUBROW_FONT)
+            label_item.setForeground(_SUBROW_FG)
+            
+            # Columna 2 (Y): Valor editable SIN validación
+            value_item = QTableWidgetItem(value)
+            value_item.setBackground(_WHITE)  # Editable
+            # IMPORTANTE: Hacer editable y NO aplicar delegado de validación
+            value_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsEnabled)
         
-        # Columna 0 (ID): Vacía y no editable
-        empty_id = QTableWidgetItem("")
-        empty_id.setFlags(Qt.ItemIsEnabled)
-        empty_id.setBackground(QColor(245, 245, 245))  # Gris claro
         self.setItem(row, 0, empty_id)
-        
-        # Columna 1 (X): Título (no editable, negrita)
-        label_item = QTableWidgetItem(label)
-        label_item.setFlags(Qt.ItemIsEnabled)
-        label_item.setBackground(QColor(245, 245, 245))  # Gris claro
-        label_item.setFont(QFont("Arial", 9, QFont.Bold))
-        label_item.setForeground(QColor(60, 60, 60))  # Gris oscuro para texto
         self.setItem(row, 1, label_item)
-        
-        # Columna 2 (Y): Valor editable SIN validación
-        value_item = QTableWidgetItem(value)
-        value_item.setBackground(QColor(255, 255, 255))  # Blanco (editable)
-        # IMPORTANTE: Hacer editable y NO aplicar delegado de validación
-        value_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsEnabled)
         self.setItem(row, 2, value_item)
+        return value_item
+    
+    def _recycle_subrows(self, row):
+        """
+        Retira los items de las sub-filas de la curva en `row` y los guarda
+        en _subrow_pool para la próxima mark_as_curve.
+        
+        Args:
+            row: Índice de la fila principal (curva)
+        """
+        if len(self._subrow_pool) >= _SUBROW_POOL_MAX:
+            return
+        
+        subrows = range(row + 1, row + 1 + len(_CURVE_SUBROW_LABELS))
+        if any(self.item(r, col) is None for r in subrows for col in range(3)):
+            return  # Sub-fila incompleta: no se reutiliza (removeRows la borra)
+        
+        block = tuple(
+            tuple(self.takeItem(r, col) for col in range(3))
+            for r in subrows
+        )
+        for _, _, value_item in block:
+            value_item.setText("")
+            value_item.setData(_VALIDITY_ROLE, None)
+        self._subrow_pool.append(block)
     
     def toggle_expansion(self, row):
         """
@@ -243,32 +565,22 @@ class CoordTable(QTableWidget):
         Args:
             row: Índice de la fila principal (curva)
         """
-        if row not in self.curve_rows:
+        if not self.is_curve(row):
             return  # No es una curva
         
-        container = self.cellWidget(row, 0)
-        if not container:
-            return
-        
-        # Get expand button from container's property
-        expand_btn = container.property("expand_btn")
-        if not expand_btn:
-            return
+        state = self._curves[row]
         
-        if row in self.expanded_rows:
+        if state.expanded:
             # Colapsar: ocultar sub-filas (6 sub-filas)
             for i in range(1, 7):
                 self.setRowHidden(row + i, True)
-            self.expanded_rows.remove(row)
-            expand_btn.setText("►")
-            expand_btn.setToolTip("Expandir parámetros de curva")
+            state.expanded = False
         else:
             # Expandir: mostrar sub-filas (6 sub-filas)
             for i in range(1, 7):
                 self.setRowHidden(row + i, False)
-            self.expanded_rows.add(row)
-            expand_btn.setText("▼")
-            expand_btn.setToolTip("Colapsar parámetros de curva")
+            state.expanded = True
+        state.header.set_expanded(state.expanded)
     
     def convert_to_point(self, row):
         """
@@ -278,39 +590,31 @@ class CoordTable(QTableWidget):
         Args:
             row: Índice de la fila a convertir
         """
-        from PySide6.QtGui import QColor
-        
-        if row not in self.curve_rows:
+        if not self.is_curve(row):
             return  # Ya es un punto
         
-        # Remover 6 sub-filas
-        for i in range(6):
-            self.removeRow(row + 1)
-        
-        # Restaurar celda de ID desde el container widget
-        container = self.cellWidget(row, 0)
-        if container:
-            # Obtener ID original del property
-            original_id = container.property("original_id")
-            if not original_id:
-                original_id = str(row + 1)  # Fallback
+        # Remove all sub-rows with a single repaint at the end
+        was_blocked = self.blockSignals(True)
+        self.setUpdatesEnabled(False)
+        try:
+            # Remover 6 sub-filas en una sola operación del modelo
+            # (sus items se guardan antes para reutilizarlos)
+            self._recycle_subrows(row)
+            self.model().removeRows(row + 1, len(_CURVE_SUBROW_LABELS))
+            
+            # Restaurar celda de ID con el ID original guardado en el estado
+            original_id = self._curves[row].original_id or str(row + 1)
             self.removeCellWidget(row, 0)
             id_item = QTableWidgetItem(original_id)
             id_item.setFlags(Qt.ItemIsEnabled)
             self.setItem(row, 0, id_item)
-        
-        # Restaurar color de fondo normal
-        for col in range(self.columnCount()):
-            item = self.item(row, col)
-            if item:
-                item.setBackground(QColor(255, 255, 255))  # Blanco
-                item.setForeground(QColor(0, 0, 0))  # Negro (texto normal)
-        
-        # Remover de conjuntos de seguimiento
-        self.curve_rows.discard(row)
-        self.expanded_rows.discard(row)
-        if row in self.curve_data:
-            del self.curve_data[row]
+            
+            # Limpiar estado de curva (vuelve el estilo normal al repintar)
+            self._curves[row] = None
+        finally:
+            self.setUpdatesEnabled(True)
+            self.blockSignals(was_blocked)
+            self.viewport().update()
         
         logger.info(f"Fila {row} convertida de curva a punto")
     
@@ -325,32 +629,70 @@ class CoordTable(QTableWidget):
             dict con keys: 'delta', 'radio', 'centro_x', 'centro_y', 'long_curva', 'sub_tan'
             (o None si no es curva)
         """
-        if row not in self.curve_rows:
+        if not self.is_curve(row):
             return None
         
-        # Leer valores de columna 2 (Y) para cada sub-fila
-        delta_item = self.item(row + 1, 2)
-        radio_item = self.item(row + 2, 2)
-        centro_x_item = self.item(row + 3, 2)  # Este (X)
-        centro_y_item = self.item(row + 4, 2)  # Norte (Y)
-        long_curva_item = self.item(row + 5, 2)
-        sub_tan_item = self.item(row + 6, 2)
-        
-        # Get individual values
-        centro_x = centro_x_item.text() if centro_x_item else ""
-        centro_y = centro_y_item.text() if centro_y_item else ""
+        # Leer valores de columna 2 (Y) de los items guardados al crear la curva
+        delta, radio, centro_x, centro_y, long_curva, sub_tan = (
+            item.text() if item is not None else ""
+            for item in self._curve_value_items(row)
+        )
         
         return {
-            'delta': delta_item.text() if delta_item else "",
-            'radio': radio_item.text() if radio_item else "",
-            'centro_x': centro_x,
-            'centro_y': centro_y,
+            'delta': delta,
+            'radio': radio,
+            'centro_x': centro_x,  # Este (X)
+            'centro_y': centro_y,  # Norte (Y)
             # Keep combined 'centro' for backward compatibility (Y, X format)
             'centro': f"{centro_y}, {centro_x}" if centro_x and centro_y else "",
-            'long_curva': long_curva_item.text() if long_curva_item else "",
-            'sub_tan': sub_tan_item.text() if sub_tan_item else ""
+            'long_curva': long_curva,
+            'sub_tan': sub_tan
         }
     
+    def _curve_value_items(self, row):
+        """
+        Items de valor (columna Y) de las sub-filas de la curva en `row`.
+        
+        Los items guardados al crear la curva se vuelven a leer de la tabla
+        si fueron reemplazados (p. ej. setItem al pegar borra el anterior).
+        """
+        state = self._curves[row]
+        items = state.items
+        if any(item is None or not isValid(item) or item.tableWidget() is not self
+               for item in items):
+            items = tuple(self.item(row + offset, 2)
+                          for offset in range(1, len(_CURVE_SUBROW_LABELS) + 1))
+            state.items = items
+        return items
+    
+    def get_curve_geometry(self, row):
+        """
+        Numeric curve parameters needed to build the arc, parsed once.
+        
+        Args:
+            row: Índice de la fila principal (curva)
+        
+        Returns:
+            Tuple (delta_text, radio, (centro_x, centro_y)) with floats for the
+            radius and center, or None if the row is not a curve or any of
+            these parameters is empty. Delta stays text since it may be DMS.
+        
+        Raises:
+            ValueError: If radio or centro are not numeric
+        """
+        params = self.get_curve_parameters(row)
+        if not params:
+            return None
+        
+        delta = params['delta']
+        radio = params['radio']
+        centro_x = params['centro_x']
+        centro_y = params['centro_y']
+        if not (delta and radio and centro_x and centro_y):
+            return None
+        
+        return delta, float(radio), (float(centro_x), float(centro_y))
+    
     def keyPressEvent(self, event):
         """
         Handle keyboard events.
@@ -358,21 +700,13 @@ class CoordTable(QTableWidget):
         Skips hidden curve sub-rows.
         """
         if event.key() == Qt.Key_Tab and self.currentColumn() == 2:
-            current_row = self.currentRow()
-            next_row = current_row + 1
-            
             # Si la siguiente fila es una sub-fila de curva, saltarla
-            while next_row < self.rowCount() and self.isRowHidden(next_row):
-                next_row += 1
+            next_row = self.next_visible_row(self.currentRow())
             
             if next_row < self.rowCount():
                 self.setCurrentCell(next_row, 1)
-                # Start editing immediately
-                item = self.item(next_row, 1)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    self.setItem(next_row, 1, item)
-                self.editItem(item)
+                # Start editing immediately (the item is created on commit)
+                self.edit(self.model().index(next_row, 1))
             return
         
         super().keyPressEvent(event)
@@ -13,6 +13,41 @@ from ui.custom_titlebar import CustomTitleBar
 class CustomDialog(QDialog):
     """Diálogo base con barra de título personalizada y soporte de temas."""
     
+    # Hojas de estilo por tema, construidas una sola vez.
+    # Fondo del diálogo = barra de título (elimina bordes blancos); el container
+    # va sin border para evitar píxeles blancos
+    _QSS_LIGHT = """
+        CustomDialog {
+            background-color: #f0f0f0;
+        }
+        QWidget#dialogContainer {
+            background-color: #f0f0f0;
+            border: none;
+            border-radius: 8px;
+        }
+        QWidget#dialogContent {
+            background-color: #ffffff;
+            color: #000000;
+        }
+    """
+    _QSS_DARK = """
+        CustomDialog {
+            background-color: #2b2b2b;
+        }
+        QWidget#dialogContainer {
+            background-color: #2b2b2b;
+            border: none;
+            border-radius: 8px;
+        }
+        QWidget#dialogContent {
+            background-color: #1e1e1e;
+            color: #ffffff;
+        }
+    """
+    
+    # Sombra deshabilitada (ver _apply_shadow); resizeEvent no la gestiona
+    _SHADOW_ENABLED = False
+    
     def __init__(self, title="", parent=None, show_logo=True):
         super().__init__(parent)
         
@@ -22,7 +57,9 @@ class CustomDialog(QDialog):
         # self.setAttribute(Qt.WA_TranslucentBackground)
         
         self._is_dark_mode = False
+        self._style_applied = False  # set_dark_mode ya aplicó algún tema
         self._is_maximized = False
+        self._shadow_hidden = False  # Sombra quitada por estar maximizado
         
         # Layout principal
         main_layout = QVBoxLayout(self)
@@ -55,7 +92,8 @@ class CustomDialog(QDialog):
         # Aplicar sombra
         self._apply_shadow()
         
-        # Aplicar estilos iniciales
+        # Estilos iniciales: el tema (claro por defecto, o el que fije la
+        # subclase con set_dark_mode) se aplica al mostrarse por primera vez
         self.set_dark_mode(False)
     
     def _apply_shadow(self):
@@ -82,46 +120,36 @@ class CustomDialog(QDialog):
     
     def set_dark_mode(self, dark):
         """Aplica el tema oscuro o claro al diálogo completo."""
+        if self._style_applied and dark == self._is_dark_mode:
+            return  # Mismo tema: no volver a parsear las hojas de estilo
         self._is_dark_mode = dark
         
+        if not self._style_applied and not self.isVisible():
+            return  # Aún no mostrado: se aplica una sola vez en showEvent
+        self._apply_theme()
+    
+    def _apply_theme(self):
+        """Aplica las hojas de estilo del tema guardado en _is_dark_mode."""
+        dark = self._is_dark_mode
+        self._style_applied = True
+        
         # Actualizar barra de título
         self.title_bar.set_dark_mode(dark)
         
-        # Colores según tema
-        if dark:
-            bg_color = "#2b2b2b"  # Mismo color que la barra de título
-            content_bg = "#1e1e1e"  # Ligeramente más oscuro
-            text_color = "#ffffff"
-            border_color = "#3d3d3d"
-        else:
-            bg_color = "#f0f0f0"  # Mismo color que la barra de título
-            content_bg = "#ffffff"  # Blanco puro
-            text_color = "#000000"
-            border_color = "#d0d0d0"
-        
-        # Aplicar color de fondo al diálogo principal para eliminar bordes blancos
-        self.setStyleSheet(f"""
-            CustomDialog {{
-                background-color: {bg_color};
-            }}
-        """)
-        # Aplicar estilos al container (sin border para evitar píxeles blancos)
-        self.container.setStyleSheet(f"""
-            QWidget#dialogContainer {{
-                background-color: {bg_color};
-                border: none;
-                border-radius: 8px;
-            }}
-            QWidget#dialogContent {{
-                background-color: {content_bg};
-                color: {text_color};
-            }}
-        """)
+        # Una sola hoja de estilo en el diálogo (un solo parseo) que cubre
+        # también container y contenido por objectName
+        self.setStyleSheet(self._QSS_DARK if dark else self._QSS_LIGHT)
     
     def set_title(self, title):
         """Cambia el título de la ventana."""
         self.title_bar.set_title(title)
     
+    def showEvent(self, event):
+        """Aplica el tema pendiente antes del primer pintado."""
+        if not self._style_applied:
+            self._apply_theme()
+        super().showEvent(event)
+    
     def changeEvent(self, event):
         """Maneja cambios de estado de la ventana."""
         if event.type() == QEvent.WindowStateChange:
@@ -131,8 +159,16 @@ class CustomDialog(QDialog):
     def resizeEvent(self, event):
         """Maneja el redimensionamiento para ajustar sombra."""
         super().resizeEvent(event)
-        # Actualizar sombra cuando cambia el tamaño
-        if self.isMaximized():
+        if not self._SHADOW_ENABLED:
+            return
+        
+        # Actualizar sombra solo cuando cambia el estado maximizado,
+        # no en cada evento de un redimensionado con el ratón
+        maximized = self.isMaximized()
+        if maximized == self._shadow_hidden:
+            return
+        self._shadow_hidden = maximized
+        if maximized:
             # Sin sombra cuando está maximizado
             self.container.setGraphicsEffect(None)
         else:
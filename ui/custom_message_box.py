@@ -4,9 +4,12 @@ Custom message box dialog with custom title bar.
 Replaces QMessageBox with styled version matching GeoWizard theme.
 """
 
+from functools import partial
+
 from PySide6.QtWidgets import QPushButton, QHBoxLayout, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+from shiboken6 import isValid
 from ui.custom_dialog import CustomDialog
 
 
@@ -25,11 +28,24 @@ class CustomMessageBox(CustomDialog):
     Yes = 0x00004000
     No = 0x00010000
     
+    # (flag, text, default) in display order
+    _BTN_SPEC = (
+        (Yes, "Sí", False),
+        (No, "No", False),
+        (Ok, "Aceptar", True),
+        (Cancel, "Cancelar", False),
+    )
+    
+    # One reusable dialog per message type (see _show)
+    _cache = {}
+    
     def __init__(self, parent=None, title="", message="", message_type=Information, buttons=Ok):
         super().__init__(title, parent, show_logo=True)
         
         self.message_type = message_type
         self.buttons_flags = buttons
+        # Button specs selected by the flags, resolved once per button set
+        self._active_buttons = self._select_buttons(buttons)
         self.clicked_button = None
         
         self.resize(450, 200)
@@ -46,53 +62,92 @@ class CustomMessageBox(CustomDialog):
         content_hbox = QHBoxLayout()
         
         # Icon
-        icon_label = QLabel()
-        icon_label.setStyleSheet(f"font-size: 48px;")
-        icon_label.setText(self._get_icon_emoji())
-        content_hbox.addWidget(icon_label)
+        self.icon_label = QLabel()
+        self.icon_label.setStyleSheet(f"font-size: 48px;")
+        self.icon_label.setText(self._get_icon_emoji())
+        content_hbox.addWidget(self.icon_label)
         
         # Message
-        message_label = QLabel(message)
-        message_label.setWordWrap(True)
-        message_label.setStyleSheet("font-size: 11pt;")
-        message_label.setTextFormat(Qt.RichText)
-        message_label.setTextInteractionFlags(Qt.TextBrowserInteraction)
-        message_label.setOpenExternalLinks(True)
-        content_hbox.addWidget(message_label, 1)
+        self.message_label = QLabel()
+        self.message_label.setWordWrap(True)
+        self.message_label.setStyleSheet("font-size: 11pt;")
+        self._set_message(message)
+        content_hbox.addWidget(self.message_label, 1)
         
         self.content_layout.addLayout(content_hbox)
         self.content_layout.addSpacing(20)
         
         # Buttons
-        button_layout = QHBoxLayout()
-        button_layout.addStretch()
+        self.button_layout = QHBoxLayout()
+        self.button_layout.addStretch()
+        self._create_buttons()
+        self.content_layout.addLayout(self.button_layout)
+    
+    def _set_message(self, message):
+        """
+        Set the message text, using the HTML engine only for markup.
         
-        if self.buttons_flags & self.Yes:
-            btn = QPushButton("Sí")
-            btn.clicked.connect(lambda: self._on_button_click(self.Yes))
+        Plain messages (no '<') are shown as plain text, which also keeps
+        their line breaks; links are only enabled for rich text.
+        """
+        label = self.message_label
+        if '<' in message:
+            label.setTextFormat(Qt.RichText)
+            label.setTextInteractionFlags(Qt.TextBrowserInteraction)
+            label.setOpenExternalLinks(True)
+        else:
+            label.setTextFormat(Qt.PlainText)
+            label.setTextInteractionFlags(Qt.NoTextInteraction)
+            label.setOpenExternalLinks(False)
+        label.setText(message)
+    
+    @classmethod
+    def _select_buttons(cls, buttons):
+        """Entries of _BTN_SPEC whose flag is set in `buttons`."""
+        return tuple(spec for spec in cls._BTN_SPEC if buttons & spec[0])
+    
+    def _create_buttons(self):
+        """Add the buttons in _active_buttons after the stretch."""
+        for flag, label, is_default in self._active_buttons:
+            btn = QPushButton(label)
+            btn.setDefault(is_default)
+            btn.clicked.connect(partial(self._on_button_click, flag))
             btn.setMinimumWidth(80)
-            button_layout.addWidget(btn)
+            self.button_layout.addWidget(btn)
+    
+    def reset(self, parent, title, message, buttons):
+        """
+        Prepare a cached message box for another exec().
         
-        if self.buttons_flags & self.No:
-            btn = QPushButton("No")
-            btn.clicked.connect(lambda: self._on_button_click(self.No))
-            btn.setMinimumWidth(80)
-            button_layout.addWidget(btn)
+        Args:
+            parent: New parent widget (theme is taken from it)
+            title: Window title
+            message: Message text (rich text)
+            buttons: Standard button flags
+        """
+        if self.parent() is not parent:
+            # setParent() drops the window flags; keep the frameless ones
+            self.setParent(parent, self.windowFlags())
+        self.set_dark_mode(bool(parent and getattr(parent, '_modo_oscuro', False)))
         
-        if self.buttons_flags & self.Ok:
-            btn = QPushButton("Aceptar")
-            btn.setDefault(True)
-            btn.clicked.connect(lambda: self._on_button_click(self.Ok))
-            btn.setMinimumWidth(80)
-            button_layout.addWidget(btn)
+        self.clicked_button = None
+        self.set_title(title)
+        self._set_message(message)
         
-        if self.buttons_flags & self.Cancel:
-            btn = QPushButton("Cancelar")
-            btn.clicked.connect(lambda: self._on_button_click(self.Cancel))
-            btn.setMinimumWidth(80)
-            button_layout.addWidget(btn)
+        if buttons != self.buttons_flags:
+            # Drop the old buttons, keeping the leading stretch
+            while self.button_layout.count() > 1:
+                widget = self.button_layout.takeAt(1).widget()
+                if widget:
+                    widget.deleteLater()
+            self.buttons_flags = buttons
+            self._active_buttons = self._select_buttons(buttons)
+            self._create_buttons()
         
-        self.content_layout.addLayout(button_layout)
+        # Open centered on the parent and at the default size again
+        self.setWindowState(Qt.WindowNoState)
+        self.setAttribute(Qt.WA_Moved, False)
+        self.resize(450, 200)
     
     def _get_icon_emoji(self):
         """Get emoji icon based on message type."""
@@ -118,32 +173,41 @@ class CustomMessageBox(CustomDialog):
         """Get which button was clicked."""
         return self.clicked_button
     
+    @classmethod
+    def _show(cls, parent, title, message, message_type, buttons):
+        """
+        Show a modal message box, reusing the cached one for this type.
+        
+        A new dialog is built only the first time, when the cached one was
+        destroyed along with its parent, or when it is already open (nested).
+        """
+        dialog = cls._cache.get(message_type)
+        if dialog is not None and isValid(dialog) and not dialog.isVisible():
+            dialog.reset(parent, title, message, buttons)
+        else:
+            dialog = cls(parent, title, message, message_type, buttons)
+            cls._cache[message_type] = dialog
+        dialog.exec()
+        return dialog.result_button()
+    
     @staticmethod
     def information(parent, title, message):
         """Show information message box."""
-        dialog = CustomMessageBox(parent, title, message, CustomMessageBox.Information, CustomMessageBox.Ok)
-        dialog.exec()
-        return dialog.result_button()
+        return CustomMessageBox._show(parent, title, message, CustomMessageBox.Information, CustomMessageBox.Ok)
     
     @staticmethod
     def warning(parent, title, message):
         """Show warning message box."""
-        dialog = CustomMessageBox(parent, title, message, CustomMessageBox.Warning, CustomMessageBox.Ok)
-        dialog.exec()
-        return dialog.result_button()
+        return CustomMessageBox._show(parent, title, message, CustomMessageBox.Warning, CustomMessageBox.Ok)
     
     @staticmethod
     def critical(parent, title, message):
         """Show critical message box."""
-        dialog = CustomMessageBox(parent, title, message, CustomMessageBox.Critical, CustomMessageBox.Ok)
-        dialog.exec()
-        return dialog.result_button()
+        return CustomMessageBox._show(parent, title, message, CustomMessageBox.Critical, CustomMessageBox.Ok)
     
     @staticmethod
     def question(parent, title, message, buttons=None):
         """Show question message box."""
         if buttons is None:
             buttons = CustomMessageBox.Yes | CustomMessageBox.No
-        dialog = CustomMessageBox(parent, title, message, CustomMessageBox.Question, buttons)
-        dialog.exec()
-        return dialog.result_button()
+        return CustomMessageBox._show(parent, title, message, CustomMessageBox.Question, buttons)
@@ -4,11 +4,158 @@ Barra de título personalizada para ventanas de GeoWizard.
 Soporta tema oscuro y claro, incluye logo de Tellus y botones minimalistas.
 """
 
-from PySide6.QtCore import Qt, Signal, QPoint, QSize, QRect
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QGraphicsColorizeEffect
-from PySide6.QtGui import QPixmap, QIcon, QCursor, QColor, QPainter, QPainterPath, QRegion
+from PySide6.QtCore import Qt, Signal, QPoint, QSize, QTimer
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtGui import QPixmap, QIcon, QCursor, QColor, QPainter, QRegion, QImage
 import os
 import sys
+from collections import OrderedDict
+from functools import lru_cache
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _base_path():
+    """Raíz de los recursos: bundle de PyInstaller o raíz del proyecto."""
+    if getattr(sys, 'frozen', False):
+        return sys._MEIPASS
+    # Ir dos niveles arriba desde ui/ para llegar a la raíz del proyecto
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Color de los iconos en tema oscuro (gris claro)
+_DARK_ICON_COLOR = QColor(220, 220, 220)
+
+
+@lru_cache(maxsize=None)
+def _titlebar_icon(icon_name, dark=False):
+    """
+    QIcon de icons/titlebar compartido por todas las barras, o None si no existe.
+    
+    La variante oscura se pinta una sola vez como lo hacía QGraphicsColorizeEffect
+    (escala de grises + tinte gris claro, conservando el alfa), en lugar de
+    aplicar el efecto a cada botón en cada repintado.
+    """
+    if dark:
+        icon = _titlebar_icon(icon_name, False)
+        if icon is None:
+            return None
+        tinted = QIcon()
+        for size in (16, 32):  # 32 para pantallas HiDPI
+            source = icon.pixmap(size, size).toImage().convertToFormat(
+                QImage.Format_ARGB32_Premultiplied
+            )
+            image = source.convertToFormat(QImage.Format_Grayscale8).convertToFormat(
+                QImage.Format_ARGB32_Premultiplied
+            )
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode_Screen)
+            painter.fillRect(image.rect(), _DARK_ICON_COLOR)
+            painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+            painter.drawImage(0, 0, source)
+            painter.end()
+            tinted.addPixmap(QPixmap.fromImage(image))
+        return tinted
+    
+    icon_path = os.path.join(_base_path(), "icons", "titlebar", icon_name)
+    if not os.path.exists(icon_path):
+        logger.warning(f"Icon not found: {icon_path}")
+        return None
+    return QIcon(icon_path)
+
+
+@lru_cache(maxsize=None)
+def _titlebar_logo():
+    """Logo de Tellus ya escalado a 24x24, compartido; None si no se encuentra."""
+    base_path = _base_path()
+    logo_path = os.path.join(base_path, "icons", "tellus_logo.png")
+    
+    if not os.path.exists(logo_path):
+        logger.warning(f"Logo not found at: {logo_path}")
+        # Intentar ruta alternativa
+        logo_path = os.path.join(os.path.dirname(base_path), "icons", "tellus_logo.png")
+        if not os.path.exists(logo_path):
+            return None
+    
+    pixmap = QPixmap(logo_path)
+    if pixmap.isNull():
+        logger.warning(f"Logo pixmap is null: {logo_path}")
+        return None
+    return pixmap.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def warm_titlebar_icons():
+    """
+    Carga y rasteriza de antemano los iconos de la barra (ambos temas) y el logo.
+    
+    Pensado para llamarse desde el bucle de eventos justo tras el arranque
+    (QIcon/QPixmap solo pueden crearse en el hilo de la GUI), de modo que el
+    primer diálogo o el primer cambio de tema no pague la carga de los SVG.
+    """
+    for icon_name in ("minimize.svg", "maximize.svg", "Close.svg"):
+        for dark in (False, True):
+            icon = _titlebar_icon(icon_name, dark)
+            if icon is not None:
+                icon.pixmap(QSize(16, 16))
+    _titlebar_logo()
+
+
+# Hoja de estilo única de la barra: ambos temas, seleccionados por la
+# propiedad dinámica "dark" (se asigna una vez; cambiar de tema solo repolisha)
+_TITLEBAR_QSS = """
+    CustomTitleBar {
+        background-color: #f0f0f0;
+        border-bottom: 1px solid #d0d0d0;
+    }
+    CustomTitleBar[dark="true"] {
+        background-color: #2b2b2b;
+        border-bottom: 1px solid #3d3d3d;
+    }
+    
+    QLabel#titleBarTitle {
+        color: #000000;
+        font-weight: normal;
+        font-size: 12px;
+    }
+    CustomTitleBar[dark="true"] QLabel#titleBarTitle {
+        color: #ffffff;
+    }
+    
+    CustomTitleBar QPushButton {
+        background-color: transparent;
+        border: none;
+        border-radius: 4px;
+    }
+    CustomTitleBar QPushButton:hover {
+        background-color: #e0e0e0;
+    }
+    CustomTitleBar QPushButton:pressed {
+        background-color: #d0d0d0;
+    }
+    CustomTitleBar[dark="true"] QPushButton:hover {
+        background-color: #3d3d3d;
+    }
+    CustomTitleBar[dark="true"] QPushButton:pressed {
+        background-color: #505050;
+    }
+    
+    /* Botón cerrar: rojo al hacer hover */
+    CustomTitleBar QPushButton#titleBarClose:hover {
+        background-color: #e81123;
+    }
+    CustomTitleBar QPushButton#titleBarClose:pressed {
+        background-color: #c42b1c;
+    }
+    CustomTitleBar[dark="true"] QPushButton#titleBarClose:hover {
+        background-color: #c42b1c;
+    }
+    CustomTitleBar[dark="true"] QPushButton#titleBarClose:pressed {
+        background-color: #a52313;
+    }
+"""
 
 
 class CustomTitleBar(QWidget):
@@ -18,15 +165,22 @@ class CustomTitleBar(QWidget):
     minimizeClicked = Signal()
     maximizeClicked = Signal()
     
+    # Máscaras de esquinas redondeadas por tamaño (w, h), compartidas entre barras
+    _mask_cache = OrderedDict()
+    _MASK_CACHE_MAX = 32
+    
     def __init__(self, title="", parent=None, show_logo=True):
         super().__init__(parent)
         self.setFixedHeight(40)
         self._dragging = False
         self._drag_position = QPoint()
+        self._pending_pos = None  # Destino del arrastre aún no aplicado
         self._is_dark_mode = False
+        self._style_applied = False  # set_dark_mode ya aplicó algún tema
         self._show_logo = show_logo
         
         self._create_ui(title)
+        self.setStyleSheet(_TITLEBAR_QSS)
         self.set_dark_mode(False)  # Start with light mode
         # Aplicar máscara de esquinas redondeadas
         self._update_mask()
@@ -47,7 +201,7 @@ class CustomTitleBar(QWidget):
         
         # Título
         self.title_label = QLabel(title)
-        self.title_label.setStyleSheet("font-weight: normal; font-size: 12px;")  # Sin bold
+        self.title_label.setObjectName("titleBarTitle")  # Estilo en _TITLEBAR_QSS (sin bold)
         layout.addWidget(self.title_label, 1)
         
         # Botones de control
@@ -73,6 +227,7 @@ class CustomTitleBar(QWidget):
         
         # Botón cerrar
         self.btn_close = QPushButton()
+        self.btn_close.setObjectName("titleBarClose")
         self.btn_close.setFixedSize(button_size, button_size)
         self.btn_close.setCursor(QCursor(Qt.PointingHandCursor))
         self.btn_close.clicked.connect(self.closeClicked)
@@ -80,154 +235,47 @@ class CustomTitleBar(QWidget):
         self._set_button_icon(self.btn_close, "Close.svg")
         layout.addWidget(self.btn_close)
     
-    def _set_button_icon(self, button, icon_name):
-        """Establece el icono SVG para un botón."""
+    def _set_button_icon(self, button, icon_name, dark=False):
+        """Establece el icono SVG (variante clara u oscura) para un botón."""
         try:
-            # Usar la misma lógica para encontrar los iconos
-            if getattr(sys, 'frozen', False):
-                base_path = sys._MEIPASS
-            else:
-                current_file = os.path.abspath(__file__)
-                ui_dir = os.path.dirname(current_file)
-                base_path = os.path.dirname(ui_dir)
-            
-            icon_path = os.path.join(base_path, "icons", "titlebar", icon_name)
-            
-            if os.path.exists(icon_path):
-                icon = QIcon(icon_path)
+            icon = _titlebar_icon(icon_name, dark)
+            if icon is not None:
                 button.setIcon(icon)
                 button.setIconSize(QSize(16, 16))  # Tamaño del icono
-            else:
-                print(f"Icon not found: {icon_path}")
         except Exception as e:
-            print(f"Error loading icon {icon_name}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"Error loading icon {icon_name}: {e}", exc_info=True)
     
     def _load_logo(self):
         """Carga el logo de Tellus Consultoría."""
         try:
-            # Usar la misma lógica que MainWindow para encontrar el logo
-            if getattr(sys, 'frozen', False):
-                base_path = sys._MEIPASS
-            else:
-                # Ir dos niveles arriba desde ui/ para llegar a la raíz del proyecto
-                current_file = os.path.abspath(__file__)
-                ui_dir = os.path.dirname(current_file)
-                base_path = os.path.dirname(ui_dir)
-            
-            logo_path = os.path.join(base_path, "icons", "tellus_logo.png")
-            
-            if os.path.exists(logo_path):
-                pixmap = QPixmap(logo_path)
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.logo_label.setPixmap(scaled_pixmap)
-                else:
-                    print(f"Logo pixmap is null: {logo_path}")
-            else:
-                print(f"Logo not found at: {logo_path}")
-                # Intentar ruta alternativa
-                alt_path = os.path.join(os.path.dirname(base_path), "icons", "tellus_logo.png")
-                if os.path.exists(alt_path):
-                    pixmap = QPixmap(alt_path)
-                    if not pixmap.isNull():
-                        scaled_pixmap = pixmap.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        self.logo_label.setPixmap(scaled_pixmap)
+            pixmap = _titlebar_logo()
+            if pixmap is not None:
+                self.logo_label.setPixmap(pixmap)
         except Exception as e:
-            print(f"Error loading logo for title bar: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"Error loading logo for title bar: {e}", exc_info=True)
     
     def set_dark_mode(self, dark):
         """Aplica el tema oscuro o claro a la barra de título."""
+        if self._style_applied and dark == self._is_dark_mode:
+            return  # Mismo tema: nada que repolish
         self._is_dark_mode = dark
+        self._style_applied = True
         
-        if dark:
-            # Tema oscuro
-            bg_color = "#2b2b2b"
-            text_color = "#ffffff"
-            button_hover = "#3d3d3d"
-            button_pressed = "#505050"
-            close_hover = "#c42b1c"
-            close_pressed = "#a52313"
-        else:
-            # Tema claro
-            bg_color = "#f0f0f0"
-            text_color = "#000000"
-            button_hover = "#e0e0e0"
-            button_pressed = "#d0d0d0"
-            close_hover = "#e81123"
-            close_pressed = "#c42b1c"
-        
-        # Estilo general de la barra con esquinas redondeadas
-        self.setStyleSheet(f"""
-            CustomTitleBar {{
-                background-color: {bg_color};
-                border-bottom: 1px solid {"#3d3d3d" if dark else "#d0d0d0"};
-            }}
-        """)
-        
-        # Estilo del título
-        self.title_label.setStyleSheet(f"""
-            QLabel {{
-                color: {text_color};
-                font-weight: normal;
-                font-size: 12px;
-            }}
-        """)
+        # Colores de barra, título y botones: cambiar la propiedad "dark" y
+        # repolish (la hoja _TITLEBAR_QSS ya está asignada y parseada)
+        self.setProperty("dark", dark)
+        for widget in (self, self.title_label, self.btn_minimize, self.btn_maximize, self.btn_close):
+            widget.style().unpolish(widget)
+            widget.style().polish(widget)
         
-        # Aplicar filtros de color a los iconos según el tema
-        self._apply_icon_filters(dark)
-        
-        # Estilos de botones minimizar y maximizar
-        button_style = f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {button_hover};
-            }}
-            QPushButton:pressed {{
-                background-color: {button_pressed};
-            }}
-        """
-        
-        self.btn_minimize.setStyleSheet(button_style)
-        self.btn_maximize.setStyleSheet(button_style)
-        
-        # Estilo especial para botón cerrar (rojo al hacer hover)
-        close_style = f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {close_hover};
-            }}
-            QPushButton:pressed {{
-                background-color: {close_pressed};
-            }}
-        """
-        
-        self.btn_close.setStyleSheet(close_style)
+        # Iconos según el tema
+        self._apply_icon_theme(dark)
     
-    def _apply_icon_filters(self, dark):
-        """Aplica filtros de color a los iconos según el tema."""
-        if dark:
-            # En modo oscuro, colorizar los iconos a blanco/gris claro
-            for btn in [self.btn_minimize, self.btn_maximize, self.btn_close]:
-                effect = QGraphicsColorizeEffect()
-                effect.setColor(QColor(220, 220, 220))  # Gris claro
-                effect.setStrength(1.0)  # Colorización completa
-                btn.setGraphicsEffect(effect)
-        else:
-            # En modo claro, quitar filtros (usar colores originales)
-            for btn in [self.btn_minimize, self.btn_maximize, self.btn_close]:
-                btn.setGraphicsEffect(None)
+    def _apply_icon_theme(self, dark):
+        """Cambia los iconos de los botones a su variante clara u oscura."""
+        self._set_button_icon(self.btn_minimize, "minimize.svg", dark)
+        self._set_button_icon(self.btn_maximize, "maximize.svg", dark)
+        self._set_button_icon(self.btn_close, "Close.svg", dark)
     
     def set_title(self, title):
         """Cambia el título de la ventana."""
@@ -252,11 +300,22 @@ class CustomTitleBar(QWidget):
     def mouseMoveEvent(self, event):
         """Arrastra la ventana."""
         if self._dragging and event.buttons() == Qt.LeftButton:
-            self.window().move(event.globalPosition().toPoint() - self._drag_position)
+            # Agrupar movimientos: como mucho un move() por vuelta del bucle
+            # de eventos, aunque el ratón reporte a alta frecuencia
+            if self._pending_pos is None:
+                QTimer.singleShot(0, self._apply_pending_move)
+            self._pending_pos = event.globalPosition().toPoint() - self._drag_position
             event.accept()
     
+    def _apply_pending_move(self):
+        """Mueve la ventana a la última posición de arrastre recibida."""
+        if self._pending_pos is not None:
+            self.window().move(self._pending_pos)
+            self._pending_pos = None
+    
     def mouseReleaseEvent(self, event):
         """Finaliza el arrastre."""
+        self._apply_pending_move()
         self._dragging = False
         event.accept()
     
@@ -273,20 +332,24 @@ class CustomTitleBar(QWidget):
     
     def _update_mask(self):
         """Aplica una máscara para recortar las esquinas superiores."""
-        # Crear path con esquinas redondeadas
-        path = QPainterPath()
-        rect = QRect(0, 0, self.width(), self.height())
-        radius = 8
+        key = (self.width(), self.height())
+        region = self._mask_cache.get(key)
+        if region is not None:
+            self._mask_cache.move_to_end(key)
+            self.setMask(region)
+            return
         
-        # Añadir rectángulo con esquinas superiores redondeadas
-        path.moveTo(rect.left(), rect.bottom())
-        path.lineTo(rect.left(), rect.top() + radius)
-        path.arcTo(rect.left(), rect.top(), radius * 2, radius * 2, 180, -90)
-        path.lineTo(rect.right() - radius, rect.top())
-        path.arcTo(rect.right() - radius * 2, rect.top(), radius * 2, radius * 2, 90, -90)
-        path.lineTo(rect.right(), rect.bottom())
-        path.lineTo(rect.left(), rect.bottom())
-        
-        # Convertir path a región y aplicar como máscara
-        region = QRegion(path.toFillPolygon().toPolygon())
+        # Rectángulos + cuartos de elipse para las esquinas superiores
+        # (sin teselar arcos en un polígono)
+        w, h = key
+        radius = 8
+        region = (
+            QRegion(0, radius, w, h - radius)                                      # Cuerpo
+            | QRegion(radius, 0, w - 2 * radius, radius)                           # Franja superior
+            | QRegion(0, 0, 2 * radius, 2 * radius, QRegion.Ellipse)               # Esquina izq.
+            | QRegion(w - 2 * radius, 0, 2 * radius, 2 * radius, QRegion.Ellipse)  # Esquina der.
+        )
+        self._mask_cache[key] = region
+        if len(self._mask_cache) > self._MASK_CACHE_MAX:
+            self._mask_cache.popitem(last=False)
         self.setMask(region)
@@ -5,9 +5,10 @@ Provides interactive editing of geometries on the canvas with
 real-time table synchronization.
 """
 
-from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsItem
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QBrush, QPen, QColor
+from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsItem, QGraphicsPathItem
+from PySide6.QtCore import Qt, QPointF, QTimer
+from PySide6.QtGui import QBrush, QPen, QColor, QPainterPath, QPolygonF
+from shiboken6 import isValid
 
 
 class EditablePoint(QGraphicsEllipseItem):
@@ -18,6 +19,11 @@ class EditablePoint(QGraphicsEllipseItem):
     Updates the coordinate table when moved.
     """
     
+    # Shared by all points (hover swaps between the two brushes)
+    _BRUSH_NORMAL = QBrush(QColor("#0078d4"))
+    _BRUSH_HOVER = QBrush(QColor("#106ebe"))
+    _PEN = QPen(QColor("#ffffff"), 2)
+    
     def __init__(self, x, y, row_index, table_widget, parent=None):
         """
         Initialize editable point.
@@ -36,6 +42,10 @@ class EditablePoint(QGraphicsEllipseItem):
         self.table = table_widget
         self.is_dragging = False  # Track drag state
         self.geometry_owner = None  # Reference to EditableGeometry
+        self.vertex_index = 0  # Index in geometry_owner.control_points
+        # Table items for X/Y, looked up once (see _coordinate_items)
+        self._x_item = None
+        self._y_item = None
         
         # Set position
         self.setPos(x, y)
@@ -46,8 +56,8 @@ class EditablePoint(QGraphicsEllipseItem):
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         
         # Visual styling
-        self.setBrush(QBrush(QColor("#0078d4")))
-        self.setPen(QPen(QColor("#ffffff"), 2))
+        self.setBrush(self._BRUSH_NORMAL)
+        self.setPen(self._PEN)
         
         # Hover effect
         self.setAcceptHoverEvents(True)
@@ -56,22 +66,20 @@ class EditablePoint(QGraphicsEllipseItem):
     def hoverEnterEvent(self, event):
         """Change appearance on hover."""
         self.is_hovered = True
-        self.setBrush(QBrush(QColor("#106ebe")))
+        self.setBrush(self._BRUSH_HOVER)
         self.setCursor(Qt.SizeAllCursor)
         super().hoverEnterEvent(event)
     
     def hoverLeaveEvent(self, event):
         """Restore appearance when hover ends."""
         self.is_hovered = False
-        self.setBrush(QBrush(QColor("#0078d4")))
+        self.setBrush(self._BRUSH_NORMAL)
         self.unsetCursor()
         super().hoverLeaveEvent(event)
     
     def mousePressEvent(self, event):
         """Mark start of drag operation."""
         self.is_dragging = True
-        # Save initial position for undo
-        self._drag_start_pos = self.scenePos()
         super().mousePressEvent(event)
     
     def mouseReleaseEvent(self, event):
@@ -83,36 +91,17 @@ class EditablePoint(QGraphicsEllipseItem):
         if self.geometry_owner:
             self.geometry_owner.update_geometry_shape()
         
-        # Create undo command if position changed
-        if hasattr(self, '_drag_start_pos') and self._drag_start_pos is not None:
-            final_pos = self.scenePos()
-            if (abs(final_pos.x() - self._drag_start_pos.x()) > 0.01 or 
-                abs(final_pos.y() - self._drag_start_pos.y()) > 0.01):
-                # Position changed, create undo command
-                if hasattr(self, 'main_window') and self.main_window:
-                    # We need to pass lat/lon for undo command
-                    # Get point ID from table row
-                    point_id = str(self.row_index + 1)
-                    
-                    # Convert scene coordinates to lat/lon for undo command
-                    # We'll use the table values which are already in the correct system
-                    old_x = self._drag_start_pos.x()
-                    old_y = self._drag_start_pos.y()
-                    new_x = final_pos.x()
-                    new_y = final_pos.y()
-                    
-                    # For canvas edits, we can't easily get lat/lon, so we skip undo for now
-                    # The undo system works mainly for web map edits
-                    pass
-                    
+        # No undo command for canvas edits: they only have scene coordinates,
+        # and the undo system works with the lat/lon of web map edits
         super().mouseReleaseEvent(event)
     
     def itemChange(self, change, value):
         """Handle item changes, especially position changes."""
         if change == QGraphicsItem.ItemPositionChange:
             # During drag, update geometry in real-time without table update
+            # (value is the new position; only this vertex changes)
             if self.is_dragging and self.geometry_owner:
-                self.geometry_owner.update_geometry_shape()
+                self.geometry_owner.point_moved(self, value)
         elif change == QGraphicsItem.ItemPositionHasChanged:
             # Only update table if NOT dragging (e.g., programmatic moves)
             if not self.is_dragging:
@@ -125,23 +114,39 @@ class EditablePoint(QGraphicsEllipseItem):
         if self.table is None:
             return
         
-        # Get new position in scene coordinates
         pos = self.scenePos()
+        x_item, y_item = self._coordinate_items()
         
         # Update table (block signals to prevent recursion)
-        self.table.blockSignals(True)
+        was_blocked = self.table.blockSignals(True)
         try:
             # Update X coordinate
-            x_item = self.table.item(self.row_index, 1)
             if x_item:
                 x_item.setText(f"{pos.x():.2f}")
             
             # Update Y coordinate
-            y_item = self.table.item(self.row_index, 2)
             if y_item:
                 y_item.setText(f"{pos.y():.2f}")
         finally:
-            self.table.blockSignals(False)
+            self.table.blockSignals(was_blocked)
+    
+    def _coordinate_items(self):
+        """
+        X/Y table items of this point's row.
+        
+        Cached after the first lookup; looked up again if the table deleted
+        them (e.g. replaced by setItem or cleared) or they left the table
+        (takeItem).
+        """
+        if not self._in_table(self._x_item):
+            self._x_item = self.table.item(self.row_index, 1)
+        if not self._in_table(self._y_item):
+            self._y_item = self.table.item(self.row_index, 2)
+        return self._x_item, self._y_item
+    
+    def _in_table(self, item):
+        """True if item is a live item still owned by this point's table."""
+        return item is not None and isValid(item) and item.tableWidget() is self.table
 
 
 class EditableGeometry:
@@ -152,7 +157,7 @@ class EditableGeometry:
     and its editable control points.
     """
     
-    def __init__(self, geometry_item, points, table_widget):
+    def __init__(self, geometry_item, points, table_widget, is_closed=None):
         """
         Initialize editable geometry.
         
@@ -160,6 +165,8 @@ class EditableGeometry:
             geometry_item: The main geometry graphics item (line, polygon, etc.)
             points: List of (x, y, row_index) tuples for control points
             table_widget: Reference to coordinate table
+            is_closed: True for polygons, False for lines; None to infer it
+                from the item's brush (filled = polygon)
         """
         self.geometry_item = geometry_item
         self.control_points = []
@@ -169,7 +176,20 @@ class EditableGeometry:
         for x, y, row_idx in points:
             point = EditablePoint(x, y, row_idx, table_widget, parent=geometry_item)
             point.geometry_owner = self  # Set back-reference
+            point.vertex_index = len(self.control_points)
             self.control_points.append(point)
+        
+        # Vertex positions (geometry_item coordinates) used to build the path;
+        # drags update one entry and rebuild the path at most once per event-loop turn
+        self._positions = [point.pos() for point in self.control_points]
+        self._rebuild_pending = False
+        # Close path if it's a polygon (known up front, not probed per rebuild)
+        if is_closed is None:
+            is_closed = (
+                isinstance(geometry_item, QGraphicsPathItem)
+                and geometry_item.brush().style() != Qt.NoBrush
+            )
+        self._is_closed = is_closed
     
     def show_points(self):
         """Show all control points."""
@@ -187,35 +207,52 @@ class EditableGeometry:
             if point.scene():
                 point.scene().removeItem(point)
         self.control_points.clear()
+        self._positions = []
+    
+    def point_moved(self, point, pos):
+        """
+        Record a dragged point's new position and schedule a path rebuild.
+        
+        Drags report many positions per frame; only the moved vertex is
+        updated here and the path is rebuilt once on the next event-loop turn.
+        
+        Args:
+            point: The EditablePoint being moved
+            pos: Its new position (geometry_item coordinates)
+        """
+        self._positions[point.vertex_index] = QPointF(pos)
+        if not self._rebuild_pending:
+            self._rebuild_pending = True
+            QTimer.singleShot(0, self._flush_geometry_shape)
+    
+    def _flush_geometry_shape(self):
+        """Rebuild the path scheduled by point_moved."""
+        self._rebuild_pending = False
+        if self.geometry_item is not None and isValid(self.geometry_item):
+            self._rebuild_path()
     
     def update_geometry_shape(self):
         """
         Update the geometry path based on current control point positions.
         This provides real-time visual feedback during dragging.
         """
-        from PySide6.QtGui import QPainterPath
-        
         if not self.control_points or not self.geometry_item:
             return
         
-        # Get current positions of all control points
-        positions = []
-        for point in self.control_points:
-            pos = point.scenePos()
-            positions.append((pos.x(), pos.y()))
-        
+        # Re-read current positions of all control points
+        self._positions = [point.pos() for point in self.control_points]
+        self._rebuild_path()
+    
+    def _rebuild_path(self):
+        """Set the geometry item's path from the stored vertex positions."""
+        positions = self._positions
         if len(positions) < 2:
             return
         
-        # Create new path
+        # Create new path from all vertices in one call
         path = QPainterPath()
-        path.moveTo(positions[0][0], positions[0][1])
-        
-        for x, y in positions[1:]:
-            path.lineTo(x, y)
-        
-        # Close path if it's a polygon (check if geometry_item has fillRule or brush)
-        if hasattr(self.geometry_item, 'brush') and self.geometry_item.brush().style() != 0:
+        path.addPolygon(QPolygonF(positions))
+        if self._is_closed:
             path.closeSubpath()
         
         # Update the geometry item's path
@@ -5,14 +5,47 @@ Provides a user-friendly error display with title, message,
 suggestions, and expandable technical details.
 """
 
+import html
+
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTextEdit
 )
-from PySide6.QtGui import QFont
 from ui.custom_dialog import CustomDialog
 
 
+# Styles of all ErrorDialog widgets, by object name. Set once on the content
+# area (the dialog itself carries the CustomDialog theme stylesheet)
+_ERROR_DIALOG_QSS = """
+    QLabel#errorSummary {
+        font-size: 11pt;
+    }
+    QTextEdit#errorDetails {
+        background-color: #f5f5f5;
+        border: 1px solid #ccc;
+        border-radius: 3px;
+        padding: 5px;
+        font-family: monospace;
+        font-size: 9pt;
+    }
+    QPushButton#errorOkButton {
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        border-radius: 3px;
+        padding: 8px 16px;
+        font-size: 10pt;
+    }
+    QPushButton#errorOkButton:hover {
+        background-color: #106ebe;
+    }
+    QPushButton#errorOkButton:pressed {
+        background-color: #005a9e;
+    }
+"""
+
+
 class ErrorDialog(CustomDialog):
     """
     Styled error dialog with user-friendly messages and suggestions.
@@ -20,9 +53,9 @@ class ErrorDialog(CustomDialog):
     
     def __init__(self, parent=None, error_info: dict = None):
         self.error_info = error_info or {}
-        title = self.error_info.get('title', 'Error')
+        self._title = self.error_info.get('title', 'Error')
         
-        super().__init__(title, parent, show_logo=True)
+        super().__init__(self._title, parent, show_logo=True)
         
         self.resize(500, 400)
         
@@ -35,44 +68,35 @@ class ErrorDialog(CustomDialog):
     def _build_ui(self):
         """Build the dialog UI."""
         # Usar content_layout heredado de CustomDialog
+        self.content_widget.setStyleSheet(_ERROR_DIALOG_QSS)
         
-        # Header with icon and title
-        header_layout = QHBoxLayout()
-        
-        # Error icon (using emoji as fallback)
-        icon_label = QLabel("⚠️")
-        icon_label.setStyleSheet("font-size: 32px;")
-        header_layout.addWidget(icon_label)
-        
-        # Title
-        title_label = QLabel(self.error_info.get('title', 'Error'))
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
-        header_layout.addWidget(title_label)
-        header_layout.addStretch()
-        
-        self.content_layout.addLayout(header_layout)
-        
-        # Message
-        message_label = QLabel(self.error_info.get('message', 'Ocurrió un error.'))
-        message_label.setWordWrap(True)
-        message_label.setStyleSheet("font-size: 11pt; margin: 10px 0;")
-        self.content_layout.addWidget(message_label)
+        # Header, message and suggestions in one rich-text label. Every
+        # field is escaped: messages and suggestions may carry exception text
+        title = html.escape(str(self._title))
+        message = html.escape(str(self.error_info.get('message', 'Ocurrió un error.')))
+        summary = (
+            '<table cellspacing="0"><tr>'
+            '<td valign="middle" style="font-size: 32px; padding-right: 8px;">⚠️</td>'
+            f'<td valign="middle" style="font-size: 14pt; font-weight: bold;">{title}</td>'
+            '</tr></table>'
+            f'<p style="margin: 10px 0;">{message.replace(chr(10), "<br>")}</p>'
+        )
         
         # Suggestions
         suggestions = self.error_info.get('suggestions', [])
         if suggestions:
-            suggestions_label = QLabel("<b>Sugerencias:</b>")
-            suggestions_label.setStyleSheet("font-size: 10pt; margin-top: 10px;")
-            self.content_layout.addWidget(suggestions_label)
-            
-            for suggestion in suggestions:
-                suggestion_label = QLabel(f"• {suggestion}")
-                suggestion_label.setWordWrap(True)
-                suggestion_label.setStyleSheet("font-size: 10pt; margin-left: 20px;")
-                self.content_layout.addWidget(suggestion_label)
+            items = "".join(f"<li>{html.escape(str(s))}</li>" for s in suggestions)
+            summary += (
+                '<p style="font-size: 10pt; margin-top: 10px; margin-bottom: 0px;"><b>Sugerencias:</b></p>'
+                '<ul style="font-size: 10pt; margin-top: 0px; margin-left: 0px; -qt-list-indent: 1;">'
+                f'{items}</ul>'
+            )
+        
+        summary_label = QLabel(summary)
+        summary_label.setTextFormat(Qt.RichText)
+        summary_label.setWordWrap(True)
+        summary_label.setObjectName("errorSummary")
+        self.content_layout.addWidget(summary_label)
         
         # Technical details (expandable)
         details = self.error_info.get('details')
@@ -85,23 +109,11 @@ class ErrorDialog(CustomDialog):
             self.details_button.clicked.connect(self._toggle_details)
             self.content_layout.addWidget(self.details_button)
             
-            # Details text (initially hidden)
-            self.details_text = QTextEdit()
-            self.details_text.setPlainText(str(details))
-            self.details_text.setReadOnly(True)
-            self.details_text.setMaximumHeight(150)
-            self.details_text.setStyleSheet("""
-                QTextEdit {
-                    background-color: #f5f5f5;
-                    border: 1px solid #ccc;
-                    border-radius: 3px;
-                    padding: 5px;
-                    font-family: monospace;
-                    font-size: 9pt;
-                }
-            """)
-            self.details_text.hide()
-            self.content_layout.addWidget(self.details_text)
+            # Details text is built on first "Mostrar detalles" (most errors
+            # are closed without opening it); it goes right below the button
+            self._details_str = str(details)
+            self._details_index = self.content_layout.indexOf(self.details_button) + 1
+            self.details_text = None
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -111,22 +123,7 @@ class ErrorDialog(CustomDialog):
         ok_button.setDefault(True)
         ok_button.clicked.connect(self.accept)
         ok_button.setMinimumWidth(100)
-        ok_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 8px 16px;
-                font-size: 10pt;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-        """)
+        ok_button.setObjectName("errorOkButton")
         button_layout.addWidget(ok_button)
         
         self.content_layout.addSpacing(10)
@@ -134,12 +131,25 @@ class ErrorDialog(CustomDialog):
     
     def _toggle_details(self):
         """Toggle technical details visibility."""
+        if self.details_text is None:
+            self._create_details_text()
+        
         if self.details_text.isVisible():
             self.details_text.hide()
             self.details_button.setText("Mostrar detalles técnicos")
         else:
             self.details_text.show()
             self.details_button.setText("Ocultar detalles técnicos")
+    
+    def _create_details_text(self):
+        """Create the (hidden) technical details box below the toggle button."""
+        self.details_text = QTextEdit()
+        self.details_text.setPlainText(self._details_str)
+        self.details_text.setReadOnly(True)
+        self.details_text.setMaximumHeight(150)
+        self.details_text.setObjectName("errorDetails")
+        self.details_text.hide()
+        self.content_layout.insertWidget(self._details_index, self.details_text)
 
 
 def show_error_dialog(parent, exception: Exception, error_info: dict = None):
@@ -5,13 +5,22 @@ Help/About dialog for GeoWizard.
 
 from PySide6.QtWidgets import QVBoxLayout, QLabel, QPushButton, QTextBrowser
 from PySide6.QtCore import Qt
+from shiboken6 import isValid
 from ui.custom_dialog import CustomDialog
-from utils.translations import tr
+from utils.translations import tr, get_current_language
 
 
 class HelpDialog(CustomDialog):
     """Help and about dialog."""
     
+    # Parsed features document per language; later opens clone it instead
+    # of formatting and parsing the HTML again
+    _features_docs = {}
+    
+    # Reusable dialog (see show_for) and the language it was built in
+    _instance = None
+    _instance_language = None
+    
     def __init__(self, parent=None):
         super().__init__(tr("help_title"), parent, show_logo=True)
         
@@ -41,7 +50,56 @@ class HelpDialog(CustomDialog):
         self.content_layout.addWidget(desc_label)
         
         # Features
-        features_text = f"""
+        help_text = QTextBrowser()
+        help_text.setOpenExternalLinks(True)
+        
+        language = get_current_language()
+        cached_doc = self._features_docs.get(language)
+        if cached_doc is not None:
+            help_text.setDocument(cached_doc.clone(help_text))
+        else:
+            help_text.setHtml(self._features_html())
+            self._features_docs[language] = help_text.document().clone()
+        self.content_layout.addWidget(help_text, 1)
+        
+        # Close button
+        btn_close = QPushButton(tr("close"))
+        btn_close.setDefault(True)
+        btn_close.clicked.connect(self.accept)
+        btn_close.setMinimumWidth(100)
+        
+        self.content_layout.addWidget(btn_close, 0, Qt.AlignCenter)
+    
+    @classmethod
+    def show_for(cls, parent):
+        """
+        Show the help dialog modally, reusing the one built earlier.
+        
+        A new dialog is built only the first time, after a language change,
+        or when the cached one was destroyed along with its parent.
+        """
+        dialog = cls._instance
+        language = get_current_language()
+        if (dialog is not None and isValid(dialog) and not dialog.isVisible()
+                and cls._instance_language == language):
+            if dialog.parent() is not parent:
+                # setParent() drops the window flags; keep the frameless ones
+                dialog.setParent(parent, dialog.windowFlags())
+            dialog.set_dark_mode(bool(parent and getattr(parent, '_modo_oscuro', False)))
+            # Open centered on the parent and at the default size again
+            dialog.setWindowState(Qt.WindowNoState)
+            dialog.setAttribute(Qt.WA_Moved, False)
+            dialog.resize(600, 500)
+        else:
+            dialog = cls(parent)
+            cls._instance = dialog
+            cls._instance_language = language
+        return dialog.exec()
+    
+    @staticmethod
+    def _features_html():
+        """HTML for the features/contact/version section in the current language."""
+        return f"""
         <h3>{tr('main_features')}</h3>
         <ul>
             <li>📍 Gestión de coordenadas en múltiples sistemas (UTM, Geográficas, Web Mercator)</li>
@@ -69,16 +127,3 @@ class HelpDialog(CustomDialog):
         <i>{tr('copyright')}</i>
         </p>
         """
-        
-        help_text = QTextBrowser()
-        help_text.setHtml(features_text)
-        help_text.setOpenExternalLinks(True)
-        self.content_layout.addWidget(help_text, 1)
-        
-        # Close button
-        btn_close = QPushButton(tr("close"))
-        btn_close.setDefault(True)
-        btn_close.clicked.connect(self.accept)
-        btn_close.setMinimumWidth(100)
-        
-        self.content_layout.addWidget(btn_close, 0, Qt.AlignCenter)
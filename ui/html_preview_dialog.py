@@ -4,7 +4,7 @@ Diálogo de previsualización para tablas HTML de coordenadas.
 Permite copiar HTML completo o formato simplificado para Word.
 """
 
-import re
+from collections import OrderedDict
 from PySide6.QtCore import Qt, QMimeData
 from PySide6.QtWidgets import (
     QVBoxLayout, QToolBar, QTextBrowser,
@@ -15,13 +15,60 @@ from ui.custom_dialog import CustomDialog
 from ui.html_table_config_dialog import HTMLTableConfigDialog, HTMLTableSettings
 
 
+# Estilo fijo de la vista previa: se parsea una vez como hoja por defecto del documento
+_PREVIEW_CSS = """
+    body {
+        display: flex;
+        justify-content: center;
+        align-items: flex-start;
+        padding: 20px;
+        margin: 0;
+    }
+    .container {
+        max-width: 100%;
+    }
+"""
+
+# Envoltorio centrado; solo {body} cambia en cada actualización
+_CENTERED_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<body>
+    <div class="container">
+        {body}
+    </div>
+</body>
+</html>
+"""
+
+# Iconos de la barra por (nombre, modo oscuro), compartidos entre aperturas
+_ICON_CACHE = {}
+
+
 class HTMLPreviewDialog(CustomDialog):
     """Diálogo para previsualizar y copiar tablas HTML."""
     
+    _TABLE_CACHE_MAX = 8
+    
+    # (texto, icono, tooltip, método); None = separador
+    _TOOLBAR_SPEC = (
+        ("⚙️ Configuración", "settings-2-fill.svg",
+         "Abrir configuración de tabla", "_open_config_dialog"),
+        None,
+        ("📋 Copiar HTML", "code-box-fill.svg",
+         "Copiar código HTML completo al portapapeles", "_copy_html"),
+        ("📋 Copiar con Formato", "Copy.svg",
+         "Copiar tabla formateada para pegar en Word, Excel, etc.", "_copy_formatted"),
+    )
+    
     def __init__(self, main_window, parent=None):
         super().__init__("Previsualización de Tabla HTML", parent, show_logo=True)
         self.main_window = main_window
         self.current_html = ""
+        # HTML generado por configuración. El diálogo es modal, así que las
+        # coordenadas y el sistema no cambian mientras vive la caché
+        self._table_cache = OrderedDict()
+        self._rendered_html = None  # Último contenido pasado a setHtml
         
         # Ajustar tamaño inicial
         self.resize(360, 600)  # 55% más pequeño en ancho (era 800)
@@ -44,6 +91,7 @@ class HTMLPreviewDialog(CustomDialog):
         # Vista previa
         self.preview_browser = QTextBrowser()
         self.preview_browser.setOpenExternalLinks(False)
+        self.preview_browser.document().setDefaultStyleSheet(_PREVIEW_CSS)
         self.content_layout.addWidget(self.preview_browser)
     
     def _create_toolbar(self):
@@ -51,49 +99,38 @@ class HTMLPreviewDialog(CustomDialog):
         toolbar = QToolBar()
         toolbar.setMovable(False)
         
-        # Botón Configuración
-        action_config = QAction("⚙️ Configuración", self)
-        action_config.setToolTip("Abrir configuración de tabla")
-        # Intentar cargar icono, sino usar emoji
-        try:
-            icon = self.main_window._icono("settings-2-fill.svg")
-            action_config.setIcon(icon)
-        except:
-            pass
-        action_config.triggered.connect(self._open_config_dialog)
-        toolbar.addAction(action_config)
-        
-        toolbar.addSeparator()
-        
-        # Botón Copiar HTML
-        action_copy_html = QAction("📋 Copiar HTML", self)
-        action_copy_html.setToolTip("Copiar código HTML completo al portapapeles")
-        try:
-            icon = self.main_window._icono("code-box-fill.svg")
-            action_copy_html.setIcon(icon)
-        except:
-            pass
-        action_copy_html.triggered.connect(self._copy_html)
-        toolbar.addAction(action_copy_html)
-        
-        # Botón Copiar con Formato
-        action_copy_formatted = QAction("📋 Copiar con Formato", self)
-        action_copy_formatted.setToolTip("Copiar tabla formateada para pegar en Word, Excel, etc.")
-        try:
-            icon = self.main_window._icono("Copy.svg")
-            action_copy_formatted.setIcon(icon)
-        except:
-            pass
-        action_copy_formatted.triggered.connect(self._copy_formatted)
-        toolbar.addAction(action_copy_formatted)
+        for spec in self._TOOLBAR_SPEC:
+            if spec is None:
+                toolbar.addSeparator()
+                continue
+            
+            text, icon_name, tooltip, handler = spec
+            action = QAction(text, self)
+            action.setToolTip(tooltip)
+            # Intentar cargar icono, sino usar emoji
+            icon = self._toolbar_icon(icon_name)
+            if icon is not None:
+                action.setIcon(icon)
+            action.triggered.connect(getattr(self, handler))
+            toolbar.addAction(action)
         
         return toolbar
     
+    def _toolbar_icon(self, icon_name):
+        """Icono de la barra, renderizado una sola vez por nombre y tema."""
+        key = (icon_name, bool(getattr(self.main_window, '_modo_oscuro', False)))
+        if key not in _ICON_CACHE:
+            try:
+                _ICON_CACHE[key] = self.main_window._icono(icon_name)
+            except Exception:
+                return None
+        return _ICON_CACHE[key]
+    
     def _generate_table(self):
         """Genera la tabla HTML con la configuración actual."""
         try:
             settings = HTMLTableSettings.load()
-            self.current_html = self.main_window._generate_coordinates_html_table(settings)
+            self.current_html = self._table_html(settings)
             self._update_preview(self.current_html)
         except Exception as e:
             QMessageBox.warning(
@@ -102,35 +139,29 @@ class HTMLPreviewDialog(CustomDialog):
                 f"No se pudo generar la tabla HTML:\\n{str(e)}"
             )
     
+    def _table_html(self, settings):
+        """Devuelve la tabla HTML para settings, reutilizando la ya generada."""
+        key = tuple(settings.to_dict().items())
+        html = self._table_cache.get(key)
+        if html is not None:
+            self._table_cache.move_to_end(key)
+            return html
+        
+        html = self.main_window._generate_coordinates_html_table(settings)
+        self._table_cache[key] = html
+        if len(self._table_cache) > self._TABLE_CACHE_MAX:
+            self._table_cache.popitem(last=False)
+        return html
+    
     def _update_preview(self, html_content):
         """Actualiza la vista previa con el contenido HTML."""
         self.current_html = html_content
+        # Mismo contenido ya mostrado: evitar re-parsear y re-maquetar
+        if html_content == self._rendered_html:
+            return
+        self._rendered_html = html_content
         # Envolver el contenido en un div centrado
-        centered_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    display: flex;
-                    justify-content: center;
-                    align-items: flex-start;
-                    padding: 20px;
-                    margin: 0;
-                }}
-                .container {{
-                    max-width: 100%;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                {html_content}
-            </div>
-        </body>
-        </html>
-        """
-        self.preview_browser.setHtml(centered_html)
+        self.preview_browser.setHtml(_CENTERED_TEMPLATE.format(body=html_content))
     
     def _copy_html(self):
         """Copia el código HTML completo al portapapeles."""
@@ -151,8 +182,9 @@ class HTMLPreviewDialog(CustomDialog):
         # Crear MimeData con formato HTML
         mime_data = QMimeData()
         mime_data.setHtml(self.current_html)
-        # También incluir texto plano como respaldo
-        mime_data.setText(self.current_html)
+        # También incluir texto plano como respaldo: el del documento ya
+        # parseado para la vista previa (sin etiquetas ni estilos)
+        mime_data.setText(self.preview_browser.toPlainText())
         
         # Establecer en clipboard
         clipboard = QApplication.clipboard()
@@ -178,7 +210,7 @@ class HTMLPreviewDialog(CustomDialog):
         """Llamado cuando la configuración cambia."""
         # Regenerar tabla con nueva configuración
         try:
-            self.current_html = self.main_window._generate_coordinates_html_table(settings)
+            self.current_html = self._table_html(settings)
             self._update_preview(self.current_html)
         except Exception as e:
             QMessageBox.warning(
@@ -4,7 +4,7 @@ Diálogo de configuración para tablas HTML de coordenadas.
 Permite personalizar bordes, colores, y formato de datos.
 """
 
-from PySide6.QtCore import Qt, Signal, QSettings
+from PySide6.QtCore import Qt, Signal, QSettings, QTimer
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QWidget,
     QGroupBox, QCheckBox, QSpinBox, QComboBox, QPushButton,
@@ -14,6 +14,16 @@ from PySide6.QtGui import QColor, QPalette
 from ui.custom_dialog import CustomDialog
 
 
+# Cierre fijo de la tabla de ejemplo
+_TABLE_EPILOGUE = """
+            </tbody>
+        </table>
+        <p style="text-align: center; margin-top: 10px; font-size: 0.9em; color: #666; font-style: italic;">
+            Tabla generada por GeoWizard - Tellus Consultoría
+        </p>
+        """
+
+
 class HTMLTableSettings:
     """Clase para almacenar y gestionar configuración de tablas HTML."""
     
@@ -84,36 +94,27 @@ class HTMLTableSettings:
             self.color_palette = palette_name
     
     def save(self):
-        """Guarda configuración en QSettings."""
+        """Guarda en QSettings solo los valores que difieren de los guardados."""
         settings = QSettings("TellusConsultoria", "GeoWizard")
         settings.beginGroup("HTMLTableExport")
         
-        # Bordes
-        settings.setValue("show_all_borders", self.show_all_borders)
-        settings.setValue("show_horizontal", self.show_horizontal)
-        settings.setValue("show_vertical", self.show_vertical)
-        settings.setValue("show_outer", self.show_outer)
-        settings.setValue("border_width", self.border_width)
-        
-        # Colores
-        settings.setValue("color_palette", self.color_palette)
-        settings.setValue("header_bg_color", self.header_bg_color)
-        settings.setValue("header_text_color", self.header_text_color)
-        settings.setValue("row_bg_color1", self.row_bg_color1)
-        settings.setValue("row_bg_color2", self.row_bg_color2)
-        settings.setValue("cell_text_color", self.cell_text_color)
-        
-        # Formato
-        settings.setValue("bearing_format", self.bearing_format)
-        settings.setValue("coord_decimals", self.coord_decimals)
-        settings.setValue("bearing_decimals", self.bearing_decimals)
-        settings.setValue("use_thousands_separator", self.use_thousands_separator)
+        # Comparar con lo que hay realmente en QSettings (otra instancia de la
+        # app puede haberlo cambiado); las claves de to_dict() son las de QSettings
+        for key, value in self.to_dict().items():
+            if not settings.contains(key) or settings.value(key, type=type(value)) != value:
+                settings.setValue(key, value)
         
         settings.endGroup()
     
     @staticmethod
     def load():
-        """Carga configuración desde QSettings."""
+        """
+        Carga configuración desde QSettings.
+        
+        Se lee de nuevo en cada llamada (otra instancia de la app puede haberla
+        cambiado); cada diálogo la carga una sola vez al abrirse y conserva
+        su instancia mientras vive.
+        """
         instance = HTMLTableSettings()
         settings = QSettings("TellusConsultoria", "GeoWizard")
         settings.beginGroup("HTMLTableExport")
@@ -173,6 +174,16 @@ class HTMLTableConfigDialog(CustomDialog):
         self.parent_window = parent_window
         self.settings = HTMLTableSettings.load()
         
+        # Vista previa en tiempo real: una sola regeneración por ráfaga de
+        # cambios (p. ej. mantener pulsada la flecha de un spinbox)
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(60)
+        self._preview_timer.timeout.connect(self._update_preview)
+        self._preview_key = None  # Configuración que muestra la vista previa
+        self._preview_colors = {}  # Color mostrado por cada muestra de color
+        self._scaffold_cache = {}  # Encabezado de tabla por (bordes, colores)
+        
         # Ajustar tamaño
         self.resize(315, 600)  # 55% más pequeño en ancho (era 700)
         
@@ -203,10 +214,15 @@ class HTMLTableConfigDialog(CustomDialog):
         self.chk_realtime.toggled.connect(self._on_realtime_toggled)
         preview_layout.addWidget(self.chk_realtime)
         
-        self.preview_browser = QTextBrowser()
-        self.preview_browser.setMinimumHeight(200)
-        self.preview_browser.setEnabled(False)
-        preview_layout.addWidget(self.preview_browser)
+        # El QTextBrowser se crea al activar la vista previa por primera vez;
+        # hasta entonces un marco vacío ocupa su lugar
+        self.preview_browser = None
+        self._preview_placeholder = QFrame()
+        self._preview_placeholder.setFrameStyle(QFrame.StyledPanel | QFrame.Sunken)
+        self._preview_placeholder.setMinimumHeight(200)
+        self._preview_placeholder.setEnabled(False)
+        self._preview_layout = preview_layout
+        preview_layout.addWidget(self._preview_placeholder)
         
         preview_group.setLayout(preview_layout)
         self.content_layout.addWidget(preview_group)
@@ -426,11 +442,18 @@ class HTMLTableConfigDialog(CustomDialog):
     
     def _update_color_previews(self):
         """Actualiza los previews de colores."""
-        self.lbl_header_bg_preview.setStyleSheet(f"background-color: {self.settings.header_bg_color};")
-        self.lbl_header_text_preview.setStyleSheet(f"background-color: {self.settings.header_text_color};")
-        self.lbl_row1_preview.setStyleSheet(f"background-color: {self.settings.row_bg_color1};")
-        self.lbl_row2_preview.setStyleSheet(f"background-color: {self.settings.row_bg_color2};")
-        self.lbl_cell_text_preview.setStyleSheet(f"background-color: {self.settings.cell_text_color};")
+        previews = (
+            (self.lbl_header_bg_preview, self.settings.header_bg_color),
+            (self.lbl_header_text_preview, self.settings.header_text_color),
+            (self.lbl_row1_preview, self.settings.row_bg_color1),
+            (self.lbl_row2_preview, self.settings.row_bg_color2),
+            (self.lbl_cell_text_preview, self.settings.cell_text_color),
+        )
+        for label, color in previews:
+            # Solo re-parsear la hoja de estilo de los colores que cambiaron
+            if self._preview_colors.get(label) != color:
+                self._preview_colors[label] = color
+                label.setStyleSheet(f"background-color: {color};")
     
     def _on_border_option_changed(self):
         """Maneja cambios en opciones de bordes."""
@@ -511,18 +534,38 @@ class HTMLTableConfigDialog(CustomDialog):
         
         # Actualizar vista previa si está habilitada
         if self.chk_realtime.isChecked():
-            self._update_preview()
+            self._preview_timer.start()
     
     def _on_realtime_toggled(self, checked):
         """Maneja activación/desactivación de vista previa en tiempo real."""
+        if checked and self.preview_browser is None:
+            self._create_preview_browser()
+        if self.preview_browser is None:
+            return
+        
         self.preview_browser.setEnabled(checked)
         if checked:
             self._update_preview()
         else:
+            self._preview_timer.stop()
+            self._preview_key = None
             self.preview_browser.clear()
     
+    def _create_preview_browser(self):
+        """Crea el QTextBrowser de la vista previa en lugar del marco vacío."""
+        self.preview_browser = QTextBrowser()
+        self.preview_browser.setMinimumHeight(200)
+        self._preview_layout.replaceWidget(self._preview_placeholder, self.preview_browser)
+        self._preview_placeholder.deleteLater()
+        self._preview_placeholder = None
+    
     def _update_preview(self):
         """Actualiza la vista previa."""
+        # Misma configuración que la ya mostrada: nada que regenerar
+        key = tuple(self.settings.to_dict().items())
+        if key == self._preview_key:
+            return
+        self._preview_key = key
         html = self._generate_example_table()
         self.preview_browser.setHtml(html)
     
@@ -553,11 +596,14 @@ class HTMLTableConfigDialog(CustomDialog):
         else:
             border_style = "border: none;"
         
-        # Construir HTML
-        html = f"""
+        # Construir HTML: encabezado reutilizado por (bordes, colores)
+        key = (border_style, self.settings.header_bg_color, self.settings.header_text_color)
+        prelude = self._scaffold_cache.get(key)
+        if prelude is None:
+            prelude = f"""
         <table style="border-collapse: collapse; width: 100%; font-family: Arial, sans-serif;">
             <thead>
-                <tr style="background-color: {self.settings.header_bg_color}; color: {self.settings.header_text_color};">
+                <tr style="background-color: {key[1]}; color: {key[2]};">
                     <th style="padding: 8px; {border_style}">ID</th>
                     <th style="padding: 8px; {border_style}">Rumbo (°)</th>
                     <th style="padding: 8px; {border_style}">X (m)</th>
@@ -566,37 +612,32 @@ class HTMLTableConfigDialog(CustomDialog):
             </thead>
             <tbody>
         """
-        
-        for i, (id_val, bearing, x, y) in enumerate(data):
-            row_bg = self.settings.row_bg_color1 if i % 2 == 0 else self.settings.row_bg_color2
-            bearing_str = f"{bearing:.{self.settings.bearing_decimals}f}" if bearing is not None else "N/A"
-            
-            # Formatear con o sin separador de miles
-            if self.settings.use_thousands_separator:
-                x_str = f"{x:,.{self.settings.coord_decimals}f}"
-                y_str = f"{y:,.{self.settings.coord_decimals}f}"
-            else:
-                x_str = f"{x:.{self.settings.coord_decimals}f}"
-                y_str = f"{y:.{self.settings.coord_decimals}f}"
-            
-            html += f"""
-                <tr style="background-color: {row_bg}; color: {self.settings.cell_text_color};">
-                    <td style="padding: 6px; {border_style} text-align: center;">{id_val}</td>
-                    <td style="padding: 6px; {border_style} text-align: right;">{bearing_str}</td>
-                    <td style="padding: 6px; {border_style} text-align: right;">{x_str}</td>
-                    <td style="padding: 6px; {border_style} text-align: right;">{y_str}</td>
+            self._scaffold_cache[key] = prelude
+        
+        # Plantillas de fila (par/impar) con estilos y colores ya expandidos;
+        # en el bucle solo se formatean los valores
+        row_tmpl = """
+                <tr style="background-color: %s; color: {text};">
+                    <td style="padding: 6px; {border} text-align: center;">%%s</td>
+                    <td style="padding: 6px; {border} text-align: right;">%%s</td>
+                    <td style="padding: 6px; {border} text-align: right;">%%s</td>
+                    <td style="padding: 6px; {border} text-align: right;">%%s</td>
                 </tr>
-            """
+            """.format(text=self.settings.cell_text_color, border=border_style)
+        row_templates = (row_tmpl % self.settings.row_bg_color1,
+                         row_tmpl % self.settings.row_bg_color2)
         
-        html += """
-            </tbody>
-        </table>
-        <p style="text-align: center; margin-top: 10px; font-size: 0.9em; color: #666; font-style: italic;">
-            Tabla generada por GeoWizard - Tellus Consultoría
-        </p>
-        """
+        # Formato con o sin separador de miles
+        coord_fmt = f"{',' if self.settings.use_thousands_separator else ''}.{self.settings.coord_decimals}f"
+        bearing_fmt = f".{self.settings.bearing_decimals}f"
         
-        return html
+        rows = []
+        for i, (id_val, bearing, x, y) in enumerate(data):
+            bearing_str = format(bearing, bearing_fmt) if bearing is not None else "N/A"
+            rows.append(row_templates[i % 2] % (
+                id_val, bearing_str, format(x, coord_fmt), format(y, coord_fmt)))
+        
+        return prelude + "".join(rows) + _TABLE_EPILOGUE
     
     def _on_save(self):
         """Guarda la configuración y cierra el diálogo."""
@@ -4,10 +4,8 @@ import json
 
 from PySide6.QtCore import (
     Qt,
-    QRegularExpression,
     QSize,
     QItemSelectionModel,
-    QEvent,
     QUrl,
     QUrlQuery,
     QRectF,
@@ -21,7 +19,6 @@ from PySide6.QtCore import (
 )
 from PySide6.QtGui import (
     QAction,
-    QRegularExpressionValidator,
     QBrush,
     QPen,
     QPixmap,
@@ -39,7 +36,7 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QTableWidget, QTableWidgetItem, QComboBox, QCheckBox, QPushButton,
     QGraphicsView, QGraphicsScene, QGraphicsTextItem, QFileDialog, QApplication,
-    QToolBar, QStyledItemDelegate, QHeaderView, QDialog, QStyleOptionViewItem,
+    QToolBar, QHeaderView, QDialog, QStyleOptionViewItem,
     QStackedLayout, QStatusBar, QMenu, QTextEdit
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
@@ -95,83 +92,6 @@ from ui.table_manager import TableManager  # Refactored table operations
 # Initialize logger for this module
 logger = get_logger(__name__)
 
-class UTMDelegate(QStyledItemDelegate):
-    def createEditor(self, parent, option, index):
-        editor = super().createEditor(parent, option, index)
-        
-        # Obtener la tabla para verificar si es una sub-fila de curva
-        table = parent.parent() if hasattr(parent, 'parent') else None
-        row = index.row()
-        
-        # Skip validation for curve sub-rows
-        is_curve_subrow = False
-        if table and hasattr(table, 'curve_rows'):
-            # Check if this row is a sub-row of any curve
-            for curve_row in table.curve_rows:
-                # Sub-rows are curve_row+1 to curve_row+5
-                if curve_row < row <= curve_row + 5:
-                    is_curve_subrow = True
-                    break
-        
-        # Only apply UTM validation to normal coordinate rows
-        if not is_curve_subrow:
-            # 6-7 dígitos + decimales opcionales
-            rx = QRegularExpression(r'^\d{6,7}(\.\d+)?$')
-            editor.setValidator(QRegularExpressionValidator(rx, editor))
-        
-        editor.installEventFilter(self)
-        editor.setProperty("row", index.row())
-        editor.setProperty("column", index.column())
-        return editor
-
-    def eventFilter(self, obj, event):
-        if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Tab:
-            table = obj.parent()
-            while table and not isinstance(table, QTableWidget):
-                table = table.parent()
-            if not table:
-                return False
-            row = obj.property("row")
-            col = obj.property("column")
-            if col == 1:
-                table.setCurrentCell(row, 2)
-                item = table.item(row, 2)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    table.setItem(row, 2, item)
-                table.editItem(item)
-            elif col == 2:
-                next_row = row + 1
-                if next_row >= table.rowCount():
-                    table.insertRow(next_row)
-                    id_it = QTableWidgetItem(str(next_row + 1))
-                    id_it.setFlags(Qt.ItemIsEnabled)
-                    table.setItem(next_row, 0, id_it)
-                table.setCurrentCell(next_row, 1)
-                item = table.item(next_row, 1)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    table.setItem(next_row, 1, item)
-                table.editItem(item)
-            return True
-        return super().eventFilter(obj, event)
-
-    def setModelData(self, editor, model, index):
-        text = editor.text()
-        model.setData(index, text)
-        
-        # Only apply color validation if editor has a validator
-        if editor.validator():
-            if not (model.flags(index) & Qt.ItemIsSelectable and
-                    model.data(index, Qt.BackgroundRole)):
-                color = Qt.black if editor.hasAcceptableInput() else Qt.red
-                model.setData(index, QBrush(color), Qt.ForegroundRole)
-        else:
-            # No validator = curve sub-row = always black text
-            model.setData(index, QBrush(Qt.black), Qt.ForegroundRole)
-
-
-
 class CanvasView(QGraphicsView):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -1318,11 +1238,7 @@ class MainWindow(QMainWindow):
             xi = self.table.item(r,1); yi = self.table.item(r,2)
             if xi and yi and xi.text().strip() and yi.text().strip():
                 if r == self.table.rowCount()-1:
-                    nr = self.table.rowCount()
-                    self.table.insertRow(nr)
-                    id_it = QTableWidgetItem(str(nr+1))
-                    id_it.setFlags(Qt.ItemIsEnabled)
-                    self.table.setItem(nr,0,id_it)
+                    self.table.append_point_row()
         
         # Skip automatic redraw if in edit mode - editable points handle their own updates
         if self._edit_mode:
@@ -1358,7 +1274,7 @@ class MainWindow(QMainWindow):
         vertex_type_menu = menu.addMenu("Tipo de vértice")
         
         current_row = self.table.currentRow()
-        is_curve = current_row in getattr(self.table, 'curve_rows', set())
+        is_curve = self.table.is_curve(current_row)
         
         # Opciones con checkmark
         punto_action = vertex_type_menu.addAction("Punto")
@@ -1550,7 +1466,7 @@ class MainWindow(QMainWindow):
                     continue
             
             # Check if this is a curve row
-            if r in getattr(self.table, 'curve_rows', set()):
+            if self.table.is_curve(r):
                 # Process curve: get main coordinate and curve parameters
                 xi = self.table.item(r, 1)
                 yi = self.table.item(r, 2)
@@ -1578,90 +1494,86 @@ class MainWindow(QMainWindow):
                             start_point_utm = transformer_wgs84_to_utm.transform(lon, lat)
                         
                         if start_point_utm:
-                            # Get curve parameters
-                            params = self.table.get_curve_parameters(r)
-                            if params and params['delta'] and params['radio'] and params['centro']:
+                            # Get curve parameters (numeric fields parsed once by the table)
+                            curve_geom = self.table.get_curve_geometry(r)
+                            if curve_geom:
                                 from core.curve_geometry import CurveSegment
                                 
-                                # Parse centro (format: "Y, X" or "Y X")
-                                centro_str = params['centro'].replace(',', ' ').split()
-                                if len(centro_str) >= 2:
-                                    # Centro format: "Y, X" (Norte, Este)
-                                    centro_utm = (float(centro_str[1]), float(centro_str[0]))  # (X, Y) / (Este, Norte)
-                                    
-                                    # NOTE: NO usamos el siguiente punto de la tabla como end_point
-                                    # El PT (Punto de Tangencia) se calcula matemáticamente 
-                                    # a partir de PC, Centro, Delta y Radio
-                                    
-                                    # Determinar dirección de la curva automáticamente
-                                    # Usamos el producto cruz entre el vector de entrada y el vector al centro
-                                    # Si el centro está a la IZQUIERDA del camino -> antihorario
-                                    # Si el centro está a la DERECHA del camino -> horario
-                                    clockwise = True  # Default
-                                    
-                                    # Encontrar el punto anterior (para determinar dirección de entrada)
-                                    prev_point_utm = None
-                                    if len(coords) > 0:
-                                        # Usar el último punto agregado como punto anterior
-                                        prev_point_utm = coords[-1]
-                                    
-                                    if prev_point_utm:
-                                        # Vector de entrada: prev_point -> start_point (PC)
-                                        dx_in = start_point_utm[0] - prev_point_utm[0]
-                                        dy_in = start_point_utm[1] - prev_point_utm[1]
-                                        
-                                        # Vector al centro: start_point (PC) -> center
-                                        dx_center = centro_utm[0] - start_point_utm[0]
-                                        dy_center = centro_utm[1] - start_point_utm[1]
-                                        
-                                        # Producto cruz: dx_in * dy_center - dy_in * dx_center
-                                        # La curva debe curvarse HACIA el centro
-                                        # Positivo = centro a la izquierda = horario (curva hacia izquierda)
-                                        # Negativo = centro a la derecha = antihorario (curva hacia derecha)
-                                        cross = dx_in * dy_center - dy_in * dx_center
-                                        clockwise = cross > 0  # Inverted: curve toward center
-                                        logger.info(f"Curva en fila {r}: cross={cross:.2f}, clockwise={clockwise}")
-                                    
-                                    # CORRECTED: The curve row coords are the PT (end point), not PC (start)
-                                    # - start_point = previous point in coords (e.g., point 8)
-                                    # - end_point = curve row coordinates (the PT, e.g., point 9 = point 1)
-                                    actual_start = prev_point_utm if prev_point_utm else start_point_utm
-                                    actual_end = start_point_utm  # The curve row coords ARE the end point
-                                    
-                                    logger.info(f"Curva: start={actual_start}, end={actual_end}, centro={centro_utm}")
-                                    
-                                    # Create curve segment with corrected start/end
-                                    curve = CurveSegment(
-                                        start_point=actual_start,
-                                        end_point=actual_end,
-                                        center=centro_utm,
-                                        delta=params['delta'],
-                                        radius=float(params['radio']),
-                                        clockwise=clockwise
-                                    )
-                                    
-                                    # No need to track next vertex row - we're not looking forward anymore
-                                    
-                                    # Validate curve (optional - for logging only)
-                                    is_valid, error_msg = curve.validate()
-                                    if not is_valid:
-                                        # Log warning but still draw the curve
-                                        logger.info(f"Curva en fila {r}: {error_msg} (dibujando de todos modos)")
-                                    
-                                    # Always densify and draw curve regardless of validation
-                                    num_points = getattr(self.table, 'curve_densification_points', 15)
-                                    densified_points = curve.densify(num_points)
+                                delta_text, radius, centro_utm = curve_geom  # centro: (X, Y) / (Este, Norte)
+                                
+                                # NOTE: NO usamos el siguiente punto de la tabla como end_point
+                                # El PT (Punto de Tangencia) se calcula matemáticamente 
+                                # a partir de PC, Centro, Delta y Radio
+                                
+                                # Determinar dirección de la curva automáticamente
+                                # Usamos el producto cruz entre el vector de entrada y el vector al centro
+                                # Si el centro está a la IZQUIERDA del camino -> antihorario
+                                # Si el centro está a la DERECHA del camino -> horario
+                                clockwise = True  # Default
+                                
+                                # Encontrar el punto anterior (para determinar dirección de entrada)
+                                prev_point_utm = None
+                                if len(coords) > 0:
+                                    # Usar el último punto agregado como punto anterior
+                                    prev_point_utm = coords[-1]
+                                
+                                if prev_point_utm:
+                                    # Vector de entrada: prev_point -> start_point (PC)
+                                    dx_in = start_point_utm[0] - prev_point_utm[0]
+                                    dy_in = start_point_utm[1] - prev_point_utm[1]
                                     
-                                    # DEBUG: Log densification results
-                                    logger.info(f"Curva densificada: {len(densified_points)} puntos generados")
-                                    if densified_points:
-                                        logger.info(f"  Primer punto densificado: {densified_points[0]}")
-                                        logger.info(f"  Último punto densificado: {densified_points[-1]}")
+                                    # Vector al centro: start_point (PC) -> center
+                                    dx_center = centro_utm[0] - start_point_utm[0]
+                                    dy_center = centro_utm[1] - start_point_utm[1]
                                     
-                                    # Add densified points to coords
-                                    coords_before = len(coords)
-                                    coords.extend(densified_points)
-                                    logger.info(f"  coords: {coords_before} -> {len(coords)} (añadidos {len(densified_points)})")
+                                    # Producto cruz: dx_in * dy_center - dy_in * dx_center
+                                    # La curva debe curvarse HACIA el centro
+                                    # Positivo = centro a la izquierda = horario (curva hacia izquierda)
+                                    # Negativo = centro a la derecha = antihorario (curva hacia derecha)
+                                    cross = dx_in * dy_center - dy_in * dx_center
+                                    clockwise = cross > 0  # Inverted: curve toward center
+                                    logger.info(f"Curva en fila {r}: cross={cross:.2f}, clockwise={clockwise}")
+                                
+                                # CORRECTED: The curve row coords are the PT (end point), not PC (start)
+                                # - start_point = previous point in coords (e.g., point 8)
+                                # - end_point = curve row coordinates (the PT, e.g., point 9 = point 1)
+                                actual_start = prev_point_utm if prev_point_utm else start_point_utm
+                                actual_end = start_point_utm  # The curve row coords ARE the end point
+                                
+                                logger.info(f"Curva: start={actual_start}, end={actual_end}, centro={centro_utm}")
+                                
+                                # Create curve segment with corrected start/end
+                                curve = CurveSegment(
+                                    start_point=actual_start,
+                                    end_point=actual_end,
+                                    center=centro_utm,
+                                    delta=delta_text,
+                                    radius=radius,
+                                    clockwise=clockwise
+                                )
+                                
+                                # No need to track next vertex row - we're not looking forward anymore
+                                
+                                # Validate curve (optional - for logging only)
+                                is_valid, error_msg = curve.validate()
+                                if not is_valid:
+                                    # Log warning but still draw the curve
+                                    logger.info(f"Curva en fila {r}: {error_msg} (dibujando de todos modos)")
+                                
+                                # Always densify and draw curve regardless of validation
+                                num_points = getattr(self.table, 'curve_densification_points', 15)
+                                densified_points = curve.densify(num_points)
+                                
+                                # DEBUG: Log densification results
+                                logger.info(f"Curva densificada: {len(densified_points)} puntos generados")
+                                if densified_points:
+                                    logger.info(f"  Primer punto densificado: {densified_points[0]}")
+                                    logger.info(f"  Último punto densificado: {densified_points[-1]}")
+                                
+                                # Add densified points to coords
+                                coords_before = len(coords)
+                                coords.extend(densified_points)
+                                logger.info(f"  coords: {coords_before} -> {len(coords)} (añadidos {len(densified_points)})")
                             else:
                                 # Curve without complete parameters, add as regular point
                                 coords.append(start_point_utm)
@@ -3207,8 +3119,7 @@ class MainWindow(QMainWindow):
         )
 
     def _on_help(self):
-        dialog = HelpDialog(self)
-        dialog.exec()
+        HelpDialog.show_for(self)
 
     def _on_export_html(self):
         """Export coordinates as HTML table with preview dialog."""
@@ -3711,17 +3622,8 @@ class MainWindow(QMainWindow):
         # Block signals to prevent triggering updates during restoration
         self.table.blockSignals(True)
         try:
-            # Clear current table
-            self.table.setRowCount(0)
-            
             # Restore rows
-            for row_idx, row_data in enumerate(self._original_table_state):
-                self.table.insertRow(row_idx)
-                for col_idx, cell_text in enumerate(row_data):
-                    item = QTableWidgetItem(cell_text)
-                    if col_idx == 0:  # ID column
-                        item.setFlags(Qt.ItemIsEnabled)
-                    self.table.setItem(row_idx, col_idx, item)
+            self.table.load_rows(self._original_table_state)
             
             # Restore coordinate system settings
             if self._original_coord_system:
@@ -3940,19 +3842,13 @@ class MainWindow(QMainWindow):
             # Block signals to prevent auto-creating empty rows
             self.table.blockSignals(True)
             try:
-                # Insert new row
-                self.table.insertRow(insert_row)
+                # Insert new row with the next point ID (other rows keep
+                # theirs: no renumbering, curve sub-rows untouched)
+                self.table.insert_point_row(insert_row)
                 
                 # Set coordinates
                 self.table.setItem(insert_row, 1, QTableWidgetItem(x_str))
                 self.table.setItem(insert_row, 2, QTableWidgetItem(y_str))
-                
-                # Renumber all IDs sequentially
-                for row in range(self.table.rowCount()):
-                    id_item = QTableWidgetItem(str(row + 1))
-                    id_item.setFlags(Qt.ItemIsEnabled)
-                    self.table.setItem(row, 0, id_item)
-                    
             finally:
                 self.table.blockSignals(False)
             
@@ -69,13 +69,16 @@ class TableManager(QObject):
         Returns:
             Index of the new row
         """
-        r = self.table.rowCount()
-        self.table.insertRow(r)
-        
-        # Set ID (read-only)
-        id_item = QTableWidgetItem(str(r + 1))
-        id_item.setFlags(Qt.ItemIsEnabled)
-        self.table.setItem(r, 0, id_item)
+        if hasattr(self.table, 'append_point_row'):
+            r = self.table.append_point_row()
+        else:
+            r = self.table.rowCount()
+            self.table.insertRow(r)
+            
+            # Set ID (read-only)
+            id_item = QTableWidgetItem(str(r + 1))
+            id_item.setFlags(Qt.ItemIsEnabled)
+            self.table.setItem(r, 0, id_item)
         
         # Set focus to X column
         self.table.setCurrentCell(r, 1)
@@ -147,10 +150,14 @@ class TableManager(QObject):
             
             # Ensure row exists
             if r >= self.table.rowCount():
-                self.table.insertRow(r)
-                id_item = QTableWidgetItem(str(r + 1))
-                id_item.setFlags(Qt.ItemIsEnabled)
-                self.table.setItem(r, 0, id_item)
+                if hasattr(self.table, 'append_point_row'):
+                    # Next point ID, not the row index (curve sub-rows take rows)
+                    r = self.table.append_point_row()
+                else:
+                    self.table.insertRow(r)
+                    id_item = QTableWidgetItem(str(r + 1))
+                    id_item.setFlags(Qt.ItemIsEnabled)
+                    self.table.setItem(r, 0, id_item)
             
             # Parse coordinates (comma or tab separated)
             pts = [p.strip() for p in ln.split(",")]
@@ -266,15 +273,7 @@ class TableManager(QObject):
         self.table.blockSignals(True)
         try:
             # Clear and restore table
-            self.table.setRowCount(0)
-            
-            for row_idx, row_data in enumerate(self._original_table_state):
-                self.table.insertRow(row_idx)
-                for col_idx, cell_text in enumerate(row_data):
-                    item = QTableWidgetItem(cell_text)
-                    if col_idx == 0:  # ID column
-                        item.setFlags(Qt.ItemIsEnabled)
-                    self.table.setItem(row_idx, col_idx, item)
+            self.table.load_rows(self._original_table_state)
             
             # Restore coordinate system settings
             if self._original_coord_system:
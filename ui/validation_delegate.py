@@ -7,6 +7,7 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QPainter, QColor, QPen
 
 from utils.coordinate_systems import validate_dms_coordinate
+from ui.coordinate_table import apply_curve_row_style
 
 
 class CoordinateValidationDelegate(QStyledItemDelegate):
@@ -168,6 +169,11 @@ class CoordinateValidationDelegate(QStyledItemDelegate):
             if table and hasattr(table, 'viewport'):
                 table.viewport().update()
     
+    def initStyleOption(self, option, index):
+        """Keep the curve row highlight on validated coordinate columns."""
+        super().initStyleOption(option, index)
+        apply_curve_row_style(option, index)
+    
     def paint(self, painter, option, index):
         """Custom paint to show red border for invalid cells."""
         # Call parent paint first for text